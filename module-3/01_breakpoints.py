@@ -21,72 +21,30 @@ Date: 2026-01-13
 Course: LangChain Academy - Introduction to LangGraph
 """
 
-from langchain_openai import ChatOpenAI
-from langgraph.checkpoint.memory import MemorySaver
+from typing import Final
+
 from langgraph.graph import MessagesState, START, StateGraph
 from langgraph.prebuilt import tools_condition, ToolNode
-from langchain_core.messages import HumanMessage, SystemMessage
-
-
-# =============================================================================
-# TOOLS DEFINITION
-# =============================================================================
-
-def multiply(a: int, b: int) -> int:
-    """
-    Multiply a and b.
-
-    Args:
-        a: first int
-        b: second int
-
-    Returns:
-        Product of a and b
-    """
-    return a * b
-
-
-def add(a: int, b: int) -> int:
-    """
-    Adds a and b.
-
-    Args:
-        a: first int
-        b: second int
-
-    Returns:
-        Sum of a and b
-    """
-    return a + b
+from langchain_core.messages import HumanMessage
 
+from _common import (
+    add, multiply, divide, get_llm_with_tools, sys_msg, tail,
+    BoundedMemorySaver, banner,
+)
 
-def divide(a: int, b: int) -> float:
-    """
-    Divide a by b.
 
-    Args:
-        a: first int
-        b: second int
-
-    Returns:
-        Division result
-    """
-    return a / b
+# Banner strings for the example output
+_ROCKETS = "🚀" * 35
 
 
 # =============================================================================
 # GRAPH SETUP
 # =============================================================================
 
-# Initialize tools and LLM
+# Initialize tools and LLM (tools are defined in _common.py; the bound
+# LLM is cached per process and shared with the other Module 3 lessons)
 tools = [add, multiply, divide]
-llm = ChatOpenAI(model="gpt-4o")
-llm_with_tools = llm.bind_tools(tools)
-
-# System message for the assistant
-sys_msg = SystemMessage(
-    content="You are a helpful assistant tasked with performing arithmetic on a set of inputs."
-)
+llm_with_tools = get_llm_with_tools(("add", "multiply", "divide"))
 
 
 # Define the assistant node
@@ -120,7 +78,7 @@ builder.add_conditional_edges(
 builder.add_edge("tools", "assistant")
 
 # Compile with checkpointer and BREAKPOINT
-memory = MemorySaver()
+memory = BoundedMemorySaver(max_threads=8)
 graph = builder.compile(
     interrupt_before=["tools"],  # ⚠️ KEY: Interrupt before tools execute
     checkpointer=memory
@@ -141,9 +99,7 @@ def run_basic_breakpoint_example():
     3. User can inspect state
     4. Resume with graph.stream(None, thread)
     """
-    print("\n" + "="*70)
-    print("EXAMPLE 1: Basic Breakpoint")
-    print("="*70)
+    banner("EXAMPLE 1: Basic Breakpoint")
 
     # Input
     initial_input = {"messages": HumanMessage(content="Multiply 2 and 3")}
@@ -151,8 +107,8 @@ def run_basic_breakpoint_example():
 
     # Run until interruption
     print("\n📍 Running until breakpoint...")
-    for event in graph.stream(initial_input, thread, stream_mode="values"):
-        event['messages'][-1].pretty_print()
+    for msg in tail(graph.stream(initial_input, thread, stream_mode="values")):
+        msg.pretty_print()
 
     # Check state
     state = graph.get_state(thread)
@@ -161,8 +117,8 @@ def run_basic_breakpoint_example():
 
     # Continue execution
     print("\n▶️ Resuming execution...")
-    for event in graph.stream(None, thread, stream_mode="values"):
-        event['messages'][-1].pretty_print()
+    for msg in tail(graph.stream(None, thread, stream_mode="values")):
+        msg.pretty_print()
 
     print("\n✅ Execution complete!")
 
@@ -177,9 +133,7 @@ def run_approval_workflow_example():
     3. If approved -> continue
     4. If rejected -> cancel
     """
-    print("\n" + "="*70)
-    print("EXAMPLE 2: Human Approval Workflow")
-    print("="*70)
+    banner("EXAMPLE 2: Human Approval Workflow")
 
     # Input
     initial_input = {"messages": HumanMessage(content="Multiply 5 and 7")}
@@ -187,8 +141,8 @@ def run_approval_workflow_example():
 
     # Run to breakpoint
     print("\n📍 Running until breakpoint...")
-    for event in graph.stream(initial_input, thread, stream_mode="values"):
-        event['messages'][-1].pretty_print()
+    for msg in tail(graph.stream(initial_input, thread, stream_mode="values")):
+        msg.pretty_print()
 
     # Get state to see what tool will be called
     state = graph.get_state(thread)
@@ -205,8 +159,8 @@ def run_approval_workflow_example():
 
     if user_approval.lower() == "yes":
         print("\n✅ Approved! Continuing execution...")
-        for event in graph.stream(None, thread, stream_mode="values"):
-            event['messages'][-1].pretty_print()
+        for msg in tail(graph.stream(None, thread, stream_mode="values")):
+            msg.pretty_print()
         print("\n✅ Task completed!")
     else:
         print("\n❌ Operation cancelled by user.")
@@ -219,9 +173,7 @@ def run_multi_approval_example():
     Since we have interrupt_before=["tools"] and the graph loops
     tools -> assistant -> tools, each tool call requires approval.
     """
-    print("\n" + "="*70)
-    print("EXAMPLE 3: Multiple Approval Points")
-    print("="*70)
+    banner("EXAMPLE 3: Multiple Approval Points")
 
     # Complex query that might need multiple tool calls
     initial_input = {
@@ -232,8 +184,8 @@ def run_multi_approval_example():
     print("\n📍 Starting complex calculation with multiple approvals...")
 
     # First run
-    for event in graph.stream(initial_input, thread, stream_mode="values"):
-        event['messages'][-1].pretty_print()
+    for msg in tail(graph.stream(initial_input, thread, stream_mode="values")):
+        msg.pretty_print()
 
     state = graph.get_state(thread)
     if state.next:
@@ -241,8 +193,8 @@ def run_multi_approval_example():
         print("✅ Approving first tool call...")
 
         # Continue
-        for event in graph.stream(None, thread, stream_mode="values"):
-            event['messages'][-1].pretty_print()
+        for msg in tail(graph.stream(None, thread, stream_mode="values")):
+            msg.pretty_print()
 
         # Check if there's another breakpoint
         state = graph.get_state(thread)
@@ -251,8 +203,8 @@ def run_multi_approval_example():
             print("✅ Approving second tool call...")
 
             # Continue again
-            for event in graph.stream(None, thread, stream_mode="values"):
-                event['messages'][-1].pretty_print()
+            for msg in tail(graph.stream(None, thread, stream_mode="values")):
+                msg.pretty_print()
 
     print("\n✅ All approvals completed!")
 
@@ -261,13 +213,7 @@ def run_multi_approval_example():
 # KEY LEARNINGS
 # =============================================================================
 
-def print_key_concepts():
-    """Print the key concepts for breakpoints."""
-    print("\n" + "="*70)
-    print("📚 KEY CONCEPTS: Breakpoints")
-    print("="*70)
-
-    concepts = """
+_KEY_CONCEPTS: Final[str] = """
     1. BREAKPOINT TYPES:
        - interrupt_before=["node"]: Stop BEFORE node executes
        - interrupt_after=["node"]: Stop AFTER node executes
@@ -283,6 +229,7 @@ def print_key_concepts():
 
     4. CHECKPOINTER REQUIRED:
        - MemorySaver() saves state between interruptions
+       - BoundedMemorySaver caps how many threads are kept in memory
        - Without checkpointer, breakpoints won't work
        - Each thread ID has its own state
 
@@ -298,7 +245,13 @@ def print_key_concepts():
        - Compliance (legal/regulatory review)
        - Debugging (inspect state at specific points)
     """
-    print(concepts)
+
+
+def print_key_concepts():
+    """Print the key concepts for breakpoints."""
+    banner("📚 KEY CONCEPTS: Breakpoints")
+
+    print(_KEY_CONCEPTS)
 
 
 # =============================================================================
@@ -306,9 +259,7 @@ def print_key_concepts():
 # =============================================================================
 
 if __name__ == "__main__":
-    print("\n" + "🚀"*35)
-    print("MODULE 3 - LESSON 1: BREAKPOINTS FOR HUMAN-IN-THE-LOOP")
-    print("🚀"*35)
+    banner("MODULE 3 - LESSON 1: BREAKPOINTS FOR HUMAN-IN-THE-LOOP", _ROCKETS)
 
     # Run examples
     run_basic_breakpoint_example()
@@ -318,8 +269,6 @@ if __name__ == "__main__":
     # Show key concepts
     print_key_concepts()
 
-    print("\n" + "="*70)
-    print("✅ Module 3, Lesson 1 Complete!")
-    print("="*70)
+    banner("✅ Module 3, Lesson 1 Complete!")
     print("\n📖 Next: edit_state_human_feedback.py - Learn to modify state at breakpoints")
     print()
@@ -7,7 +7,7 @@ inject human feedback into the agent workflow.
 Key Concepts:
 - Editing state with graph.update_state()
 - add_messages reducer behavior
-- Human feedback nodes
+- Human feedback with interrupt() and Command(resume=...)
 - as_node parameter for state updates
 - Interactive correction loops
 
@@ -22,44 +22,30 @@ Date: 2026-01-13
 Course: LangChain Academy - Introduction to LangGraph
 """
 
-from langchain_openai import ChatOpenAI
-from langgraph.checkpoint.memory import MemorySaver
+from typing import Final
+
 from langgraph.graph import MessagesState, START, StateGraph
 from langgraph.prebuilt import tools_condition, ToolNode
-from langchain_core.messages import HumanMessage, SystemMessage
-
-
-# =============================================================================
-# TOOLS DEFINITION
-# =============================================================================
-
-def multiply(a: int, b: int) -> int:
-    """Multiply a and b."""
-    return a * b
-
+from langgraph.types import Command, interrupt
+from langchain_core.messages import HumanMessage
 
-def add(a: int, b: int) -> int:
-    """Add a and b."""
-    return a + b
+from _common import (
+    add, multiply, divide, get_llm_with_tools, sys_msg, tail,
+    BoundedMemorySaver, banner,
+)
 
 
-def divide(a: int, b: int) -> float:
-    """Divide a by b."""
-    return a / b
+# Banner strings for the example output
+_ROCKETS = "🚀" * 35
 
 
 # =============================================================================
 # GRAPH 1: EDITING STATE BEFORE ASSISTANT
 # =============================================================================
 
-# Initialize tools and LLM
+# Initialize tools and LLM (shared with 01_breakpoints.py via _common.py)
 tools = [add, multiply, divide]
-llm = ChatOpenAI(model="gpt-4o")
-llm_with_tools = llm.bind_tools(tools)
-
-sys_msg = SystemMessage(
-    content="You are a helpful assistant tasked with performing arithmetic on a set of inputs."
-)
+llm_with_tools = get_llm_with_tools(("add", "multiply", "divide"))
 
 
 def assistant(state: MessagesState):
@@ -76,7 +62,7 @@ builder.add_edge(START, "assistant")
 builder.add_conditional_edges("assistant", tools_condition)
 builder.add_edge("tools", "assistant")
 
-memory = MemorySaver()
+memory = BoundedMemorySaver(max_threads=8)
 graph_edit_before = builder.compile(
     interrupt_before=["assistant"],  # ⚠️ Interrupt BEFORE assistant processes
     checkpointer=memory
@@ -84,36 +70,44 @@ graph_edit_before = builder.compile(
 
 
 # =============================================================================
-# GRAPH 2: HUMAN FEEDBACK NODE
+# GRAPH 2: HUMAN FEEDBACK VIA interrupt()
 # =============================================================================
 
-def human_feedback(state: MessagesState):
+def assistant_with_feedback(state: MessagesState):
     """
-    No-op node that serves as a placeholder for human feedback.
+    Assistant node that pauses for human feedback before calling the LLM.
+
+    interrupt() suspends the graph here; it returns whatever the caller
+    passes as Command(resume=...). A non-empty string is added to the
+    conversation as a new human instruction; an empty string means
+    "continue". LangGraph ignores resume=None, so "continue" needs a
+    real value.
 
-    This node does nothing - it's just a marker in the graph where
-    we interrupt for human input.
+    This replaces a separate no-op human_feedback node, so each turn
+    schedules (and checkpoints) one node fewer.
     """
-    pass
+    feedback = interrupt("Provide feedback for the assistant (or '' to continue)")
 
+    new_messages = []
+    if feedback:
+        new_messages.append(HumanMessage(content=feedback))
 
-# Build graph with human feedback node
+    response = llm_with_tools.invoke([sys_msg] + state["messages"] + new_messages)
+    return {"messages": new_messages + [response]}
+
+
+# Build graph - the assistant interrupts itself before every LLM call
 builder2 = StateGraph(MessagesState)
-builder2.add_node("assistant", assistant)
+builder2.add_node("assistant", assistant_with_feedback)
 builder2.add_node("tools", ToolNode(tools))
-builder2.add_node("human_feedback", human_feedback)
 
-# Flow: START -> human_feedback -> assistant -> tools -> human_feedback (loop)
-builder2.add_edge(START, "human_feedback")
-builder2.add_edge("human_feedback", "assistant")
+# Flow: START -> assistant (feedback) -> tools -> assistant (feedback) (loop)
+builder2.add_edge(START, "assistant")
 builder2.add_conditional_edges("assistant", tools_condition)
-builder2.add_edge("tools", "human_feedback")
+builder2.add_edge("tools", "assistant")
 
-memory2 = MemorySaver()
-graph_with_feedback = builder2.compile(
-    interrupt_before=["human_feedback"],  # ⚠️ Interrupt at feedback points
-    checkpointer=memory2
-)
+memory2 = BoundedMemorySaver(max_threads=8)
+graph_with_feedback = builder2.compile(checkpointer=memory2)
 
 
 # =============================================================================
@@ -130,17 +124,15 @@ def run_edit_state_example():
     3. Update state with correction
     4. Resume - assistant sees corrected input
     """
-    print("\n" + "="*70)
-    print("EXAMPLE 1: Edit State Before Processing")
-    print("="*70)
+    banner("EXAMPLE 1: Edit State Before Processing")
 
     initial_input = {"messages": "Multiply 2 and 3"}
     thread = {"configurable": {"thread_id": "1"}}
 
     # Run to breakpoint
     print("\n📍 Running to breakpoint (before assistant)...")
-    for event in graph_edit_before.stream(initial_input, thread, stream_mode="values"):
-        event['messages'][-1].pretty_print()
+    for msg in tail(graph_edit_before.stream(initial_input, thread, stream_mode="values")):
+        msg.pretty_print()
 
     # Check state
     state = graph_edit_before.get_state(thread)
@@ -167,8 +159,8 @@ def run_edit_state_example():
 
     # Resume execution
     print("\n▶️ Resuming - assistant will see corrected input...")
-    for event in graph_edit_before.stream(None, thread, stream_mode="values"):
-        event['messages'][-1].pretty_print()
+    for msg in tail(graph_edit_before.stream(None, thread, stream_mode="values")):
+        msg.pretty_print()
 
     print("\n✅ Agent used the corrected values (3 and 3)!")
 
@@ -181,17 +173,14 @@ def run_overwrite_message_example():
     - If message has ID: add_messages reducer REPLACES it
     - If no ID: add_messages reducer APPENDS it
     """
-    print("\n" + "="*70)
-    print("EXAMPLE 2: Overwrite vs Append Messages")
-    print("="*70)
+    banner("EXAMPLE 2: Overwrite vs Append Messages")
 
     initial_input = {"messages": "Multiply 5 and 6"}
     thread = {"configurable": {"thread_id": "2"}}
 
     # Run to breakpoint
     print("\n📍 Running to breakpoint...")
-    for event in graph_edit_before.stream(initial_input, thread, stream_mode="values"):
-        pass  # Silent
+    graph_edit_before.invoke(initial_input, thread)  # Silent
 
     # Get the last message with its ID
     state = graph_edit_before.get_state(thread)
@@ -220,34 +209,32 @@ def run_overwrite_message_example():
         print(f"   - {m.content}")
 
     print("\n▶️ Resuming execution...")
-    for event in graph_edit_before.stream(None, thread, stream_mode="values"):
-        event['messages'][-1].pretty_print()
+    for msg in tail(graph_edit_before.stream(None, thread, stream_mode="values")):
+        msg.pretty_print()
 
 
 def run_human_feedback_node_example():
     """
-    Example 3: Human feedback node pattern.
+    Example 3: Human feedback with interrupt().
 
     Pattern:
-    1. Graph starts at human_feedback node
-    2. User can inject instructions
+    1. Assistant node calls interrupt() before the LLM
+    2. User injects instructions via Command(resume=...)
     3. Assistant processes
     4. Tools execute
-    5. Back to human_feedback (loop)
+    5. Back to assistant, which interrupts again (loop)
 
     This creates a continuous feedback loop!
     """
-    print("\n" + "="*70)
-    print("EXAMPLE 3: Human Feedback Node Pattern")
-    print("="*70)
+    banner("EXAMPLE 3: Human Feedback with interrupt()")
 
     initial_input = {"messages": "Multiply 4 and 5"}
     thread = {"configurable": {"thread_id": "3"}}
 
     # First run
-    print("\n📍 Starting with human feedback node...")
-    for event in graph_with_feedback.stream(initial_input, thread, stream_mode="values"):
-        event["messages"][-1].pretty_print()
+    print("\n📍 Starting - assistant interrupts for feedback...")
+    for msg in tail(graph_with_feedback.stream(initial_input, thread, stream_mode="values")):
+        msg.pretty_print()
 
     state = graph_with_feedback.get_state(thread)
     print(f"\n🛑 Paused at: {state.next}")
@@ -255,34 +242,29 @@ def run_human_feedback_node_example():
     # Simulate user feedback
     print("\n💬 User provides feedback: 'Actually, use 6 and 7'")
 
-    # Update state AS IF it came from human_feedback node
-    graph_with_feedback.update_state(
-        thread,
-        {"messages": "no, multiply 6 and 7"},
-        as_node="human_feedback"  # ⚠️ KEY: Pretend this came from feedback node
-    )
-
-    # Continue execution
+    # Resume the interrupt with the feedback as its return value
     print("\n▶️ Continuing with user's feedback...")
-    for event in graph_with_feedback.stream(None, thread, stream_mode="values"):
-        event["messages"][-1].pretty_print()
+    for msg in tail(graph_with_feedback.stream(
+        Command(resume="no, multiply 6 and 7"),  # ⚠️ KEY: Becomes interrupt()'s return value
+        thread,
+        stream_mode="values"
+    )):
+        msg.pretty_print()
 
     # At next feedback point
     state = graph_with_feedback.get_state(thread)
-    if state.next and "human_feedback" in state.next:
-        print(f"\n🛑 Back at feedback node: {state.next}")
+    if state.next:
+        print(f"\n🛑 Back at feedback point: {state.next}")
         print("   User can provide more feedback or continue")
 
         # User approves - no changes
         print("\n✅ User approves - continuing without changes...")
-        graph_with_feedback.update_state(
+        for msg in tail(graph_with_feedback.stream(
+            Command(resume=""),  # No feedback
             thread,
-            {"messages": []},  # No changes
-            as_node="human_feedback"
-        )
-
-        for event in graph_with_feedback.stream(None, thread, stream_mode="values"):
-            event["messages"][-1].pretty_print()
+            stream_mode="values"
+        )):
+            msg.pretty_print()
 
     print("\n✅ Interactive feedback loop complete!")
 
@@ -293,9 +275,7 @@ def run_interactive_agent_pattern():
 
     This shows a complete interactive loop with multiple options.
     """
-    print("\n" + "="*70)
-    print("EXAMPLE 4: Production Interactive Agent")
-    print("="*70)
+    banner("EXAMPLE 4: Production Interactive Agent")
 
     initial_input = {"messages": "Multiply 8 and 9"}
     thread = {"configurable": {"thread_id": "4"}}
@@ -304,12 +284,12 @@ def run_interactive_agent_pattern():
     print("   (In production, this would have a UI)")
 
     # Initial run
-    for event in graph_with_feedback.stream(initial_input, thread, stream_mode="values"):
-        event["messages"][-1].pretty_print()
+    for msg in tail(graph_with_feedback.stream(initial_input, thread, stream_mode="values")):
+        msg.pretty_print()
 
     # Simulate multiple user interactions
     interactions = [
-        ("continue", None),  # Just continue
+        ("continue", ""),  # Just continue
         ("modify", "Actually add 10 to the result"),  # Add instruction
     ]
 
@@ -323,26 +303,17 @@ def run_interactive_agent_pattern():
         print(f"\n🛑 Paused at: {state.next}")
         print(f"   User action: {action}")
 
-        if action == "continue":
-            # No changes, just continue
-            graph_with_feedback.update_state(
-                thread,
-                {"messages": []},
-                as_node="human_feedback"
-            )
-        elif action == "modify":
-            # Add new instruction
+        if action == "modify":
             print(f"   New instruction: {instruction}")
-            graph_with_feedback.update_state(
-                thread,
-                {"messages": [HumanMessage(content=instruction)]},
-                as_node="human_feedback"
-            )
 
-        # Continue execution
+        # Resume - "" continues unchanged, a string adds an instruction
         print("\n▶️ Continuing...")
-        for event in graph_with_feedback.stream(None, thread, stream_mode="values"):
-            event["messages"][-1].pretty_print()
+        for msg in tail(graph_with_feedback.stream(
+            Command(resume=instruction),
+            thread,
+            stream_mode="values"
+        )):
+            msg.pretty_print()
 
     print("\n✅ Interactive session complete!")
 
@@ -351,13 +322,7 @@ def run_interactive_agent_pattern():
 # KEY LEARNINGS
 # =============================================================================
 
-def print_key_concepts():
-    """Print key concepts for state editing and human feedback."""
-    print("\n" + "="*70)
-    print("📚 KEY CONCEPTS: State Editing & Human Feedback")
-    print("="*70)
-
-    concepts = """
+_KEY_CONCEPTS: Final[str] = """
     1. UPDATE_STATE BASICS:
        - graph.update_state(thread, {"messages": [msg]})
        - Uses reducer to merge with existing state
@@ -372,18 +337,18 @@ def print_key_concepts():
        - update_state(..., as_node="node_name")
        - Tells graph which node "sent" the update
        - Determines next node in execution flow
-       - Critical for human feedback nodes!
 
-    4. HUMAN FEEDBACK NODE:
-       - No-op placeholder: def human_feedback(state): pass
-       - Marker for human interaction points
-       - Set interrupt_before=["human_feedback"]
+    4. HUMAN FEEDBACK WITH interrupt():
+       - feedback = interrupt("prompt") inside the node
+       - Resume with graph.stream(Command(resume=value), thread)
+       - value becomes interrupt()'s return value
+       - No extra no-op node to schedule and checkpoint
        - Creates continuous feedback loops
 
     5. INTERRUPT POSITIONS:
        - Before assistant: Edit user input before LLM sees it
        - Before tools: Review tool calls before execution
-       - At feedback node: Structured interaction points
+       - interrupt() in a node: Structured interaction points
 
     6. PRODUCTION PATTERNS:
        - Interactive correction loops
@@ -397,7 +362,13 @@ def print_key_concepts():
        - state.values['messages']: Message history
        - Use to inform user decisions
     """
-    print(concepts)
+
+
+def print_key_concepts():
+    """Print key concepts for state editing and human feedback."""
+    banner("📚 KEY CONCEPTS: State Editing & Human Feedback")
+
+    print(_KEY_CONCEPTS)
 
 
 # =============================================================================
@@ -405,9 +376,7 @@ def print_key_concepts():
 # =============================================================================
 
 if __name__ == "__main__":
-    print("\n" + "🚀"*35)
-    print("MODULE 3 - LESSON 2: EDITING STATE & HUMAN FEEDBACK")
-    print("🚀"*35)
+    banner("MODULE 3 - LESSON 2: EDITING STATE & HUMAN FEEDBACK", _ROCKETS)
 
     # Run examples
     run_edit_state_example()
@@ -418,8 +387,6 @@ if __name__ == "__main__":
     # Show key concepts
     print_key_concepts()
 
-    print("\n" + "="*70)
-    print("✅ Module 3, Lesson 2 Complete!")
-    print("="*70)
+    banner("✅ Module 3, Lesson 2 Complete!")
     print("\n📖 Next: dynamic_breakpoints.py - Learn conditional interrupts")
     print()
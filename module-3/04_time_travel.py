@@ -23,62 +23,165 @@ Date: 2026-01-13
 Course: LangChain Academy - Introduction to LangGraph
 """
 
-from langchain_openai import ChatOpenAI
+import asyncio
+import functools
+import os
+from typing import Final
+
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import MessagesState, START, StateGraph
 from langgraph.prebuilt import tools_condition, ToolNode
-from langchain_core.messages import HumanMessage, SystemMessage
-
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
 
-# =============================================================================
-# TOOLS DEFINITION
-# =============================================================================
+from _common import add, multiply, divide, get_llm_with_tools, sys_msg, banner
 
-def multiply(a: int, b: int) -> int:
-    """Multiply a and b."""
-    return a * b
 
+# Set DEMO_VERBOSE=1 for full pretty-printed messages
+VERBOSE = os.environ.get("DEMO_VERBOSE")
 
-def add(a: int, b: int) -> int:
-    """Add a and b."""
-    return a + b
-
-
-def divide(a: int, b: int) -> float:
-    """Divide a by b."""
-    return a / b
+# Banner strings for the example output
+_RULE = "-" * 70
+_ROCKETS = "🚀" * 35
 
 
 # =============================================================================
 # GRAPH SETUP
 # =============================================================================
 
+# Tools, the system message and the bound LLM come from _common.py and are
+# shared with the other Module 3 lessons
 tools = [add, multiply, divide]
-llm = ChatOpenAI(model="gpt-4o")
-llm_with_tools = llm.bind_tools(tools)
+_TOOL_NAMES = ("add", "multiply", "divide")
 
-sys_msg = SystemMessage(
-    content="You are a helpful assistant tasked with performing arithmetic on a set of inputs."
-)
+# The examples only need the assistant to emit tool calls, so by default a
+# deterministic offline model stands in for OpenAI: runs are reproducible
+# and make no API calls. Set USE_REAL_LLM=1 to use gpt-4o instead.
+_OFFLINE = not os.environ.get("USE_REAL_LLM")
 
 
 def assistant(state: MessagesState):
     """Assistant node that invokes LLM with tools."""
+    llm_with_tools = get_llm_with_tools(_TOOL_NAMES, offline=_OFFLINE)
     return {"messages": [llm_with_tools.invoke([sys_msg] + state["messages"])]}
 
 
-# Build graph
-builder = StateGraph(MessagesState)
-builder.add_node("assistant", assistant)
-builder.add_node("tools", ToolNode(tools))
+@functools.cache
+def get_time_travel_graph():
+    """
+    Build and compile the time-travel graph on first use.
+
+    Compilation happens once per process, and only when an example
+    actually needs the graph, so importing this module stays cheap.
+
+    Returns:
+        Compiled graph with a checkpointer (required for time travel!)
+    """
+    builder = StateGraph(MessagesState)
+    builder.add_node("assistant", assistant)
+    builder.add_node("tools", ToolNode(tools))
+
+    builder.add_edge(START, "assistant")
+    builder.add_conditional_edges("assistant", tools_condition)
+    builder.add_edge("tools", "assistant")
+
+    memory = MemorySaver()
+    return builder.compile(checkpointer=memory)
+
 
-builder.add_edge(START, "assistant")
-builder.add_conditional_edges("assistant", tools_condition)
-builder.add_edge("tools", "assistant")
+# Short labels for the message types that appear in a thread's history
+_MSG_TYPE_NAME = {
+    HumanMessage: "Human",
+    AIMessage: "AI",
+    ToolMessage: "Tool",
+    SystemMessage: "Sys",
+}
 
-# Compile with checkpointer (required for time travel!)
-memory = MemorySaver()
-graph = builder.compile(checkpointer=memory)
+
+def message_type_name(message):
+    """Return the short label for a message, falling back to its class name."""
+    msg_type = type(message)
+    return _MSG_TYPE_NAME.get(msg_type) or msg_type.__name__
+
+
+# Thread configs, built once and passed by reference to every call that
+# targets the thread
+THREADS = {
+    thread_id: {"configurable": {"thread_id": thread_id}}
+    for thread_id in ("1", "2", "3")
+}
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def format_message(message):
+    """
+    Render a message for the example output.
+
+    pretty_print()-style rendering (role header, tool calls) is only used
+    when DEMO_VERBOSE is set; otherwise just the content is shown, or the
+    message type when the content is empty (e.g. a pure tool-call message).
+    """
+    if VERBOSE:
+        return message.pretty_repr()
+    return message.content if message.content else f"[{message_type_name(message)}]"
+
+
+def print_updates(events):
+    """
+    Print the messages produced by a stream_mode="updates" run.
+
+    "updates" streams only each node's delta instead of the full state
+    snapshot, and the messages are rendered with a single print call.
+
+    Args:
+        events: List of events from graph.stream(..., stream_mode="updates")
+    """
+    rendered = [
+        format_message(message)
+        for event in events
+        for update in event.values()
+        if update
+        for message in update.get("messages", [])
+    ]
+    print("\n".join(rendered))
+
+
+def get_input_checkpoint(thread):
+    """
+    Fetch the checkpoint saved right after the user input (step 0).
+
+    This is the checkpoint the examples fork from. Filtering on the step
+    metadata loads that single checkpoint instead of the whole history.
+
+    Args:
+        thread: Thread config
+
+    Returns:
+        StateSnapshot whose next node is the assistant, or None if the
+        thread has no such checkpoint yet
+    """
+    graph = get_time_travel_graph()
+    return next(graph.get_state_history(thread, filter={"step": 0}, limit=1), None)
+
+
+def fork_checkpoint(config, *updates):
+    """
+    Create one fork of a checkpoint per state update.
+
+    Every update is applied to the same parent checkpoint, so the forks are
+    siblings rather than a chain.
+
+    Args:
+        config: Config of the checkpoint to fork from
+        *updates: State updates, one per fork
+
+    Returns:
+        List of fork configs, in the order of updates
+    """
+    graph = get_time_travel_graph()
+    return [graph.update_state(config, update) for update in updates]
 
 
 # =============================================================================
@@ -94,22 +197,18 @@ def run_browsing_history_example():
     - get_state_history() for all checkpoints
     - Checkpoint structure and metadata
     """
-    print("\n" + "="*70)
-    print("EXAMPLE 1: Browsing Execution History")
-    print("="*70)
+    graph = get_time_travel_graph()
+    banner("EXAMPLE 1: Browsing Execution History")
 
     # Run a complete execution
     initial_input = {"messages": HumanMessage(content="Multiply 2 and 3")}
-    thread = {"configurable": {"thread_id": "1"}}
+    thread = THREADS["1"]
 
     print("\n📍 Running agent...")
-    for event in graph.stream(initial_input, thread, stream_mode="values"):
-        event['messages'][-1].pretty_print()
+    print_updates(list(graph.stream(initial_input, thread, stream_mode="updates")))
 
     # Get current state
-    print("\n" + "="*70)
-    print("📊 CURRENT STATE")
-    print("="*70)
+    banner("📊 CURRENT STATE")
 
     current_state = graph.get_state(thread)
     print(f"\n✓ Next nodes: {current_state.next}")
@@ -118,9 +217,7 @@ def run_browsing_history_example():
     print(f"✓ Step: {current_state.metadata.get('step', 'N/A')}")
 
     # Get ALL historical states
-    print("\n" + "="*70)
-    print("📜 EXECUTION HISTORY")
-    print("="*70)
+    banner("📜 EXECUTION HISTORY")
 
     all_states = list(graph.get_state_history(thread))
     print(f"\n✓ Total checkpoints: {len(all_states)}")
@@ -129,23 +226,23 @@ def run_browsing_history_example():
     print("\n📝 Checkpoint Timeline (newest to oldest):")
     for i, state in enumerate(all_states):
         step = state.metadata.get('step', 0)
-        msg_count = len(state.values.get('messages', []))
+        messages = state.values.get('messages', [])
         next_node = state.next[0] if state.next else "END"
-        checkpoint_id = state.config['configurable']['checkpoint_id'][:12]
+        checkpoint_id = state.config['configurable']['checkpoint_id']
 
-        print(f"\n  [{i}] Step {step} | Checkpoint: {checkpoint_id}...")
-        print(f"      Messages: {msg_count} | Next: {next_node}")
+        print(f"\n  [{i}] Step {step} | Checkpoint: {checkpoint_id[:12]}...")
+        print(f"      Messages: {len(messages)} | Next: {next_node}")
 
-        # Show last message content
-        if state.values.get('messages'):
-            last_msg = state.values['messages'][-1]
-            content_preview = str(last_msg.content)[:50]
-            print(f"      Last message: {last_msg.__class__.__name__}: {content_preview}...")
+        # Show last message content (content is usually already a str;
+        # only multimodal content lists need converting before slicing)
+        if messages:
+            last_msg = messages[-1]
+            content = last_msg.content
+            content_preview = content[:50] if isinstance(content, str) else str(content)[:50]
+            print(f"      Last message: {message_type_name(last_msg)}: {content_preview}...")
 
     # Inspect a specific checkpoint in detail
-    print("\n" + "="*70)
-    print("🔍 DETAILED CHECKPOINT INSPECTION")
-    print("="*70)
+    banner("🔍 DETAILED CHECKPOINT INSPECTION")
 
     user_input_checkpoint = all_states[-2]  # Second from end = user input
     print(f"\n📌 Inspecting: User Input Checkpoint")
@@ -170,9 +267,8 @@ def run_replay_example(all_states):
     - Graph knows checkpoint was already executed
     - Exact reproduction of past execution
     """
-    print("\n" + "="*70)
-    print("EXAMPLE 2: Replaying from Checkpoint")
-    print("="*70)
+    graph = get_time_travel_graph()
+    banner("EXAMPLE 2: Replaying from Checkpoint")
 
     # Select a checkpoint to replay from
     to_replay = all_states[-2]  # User input checkpoint
@@ -184,12 +280,11 @@ def run_replay_example(all_states):
 
     # Replay execution
     print("\n▶️ Starting replay...")
-    print("-" * 70)
+    print(_RULE)
 
-    for event in graph.stream(None, to_replay.config, stream_mode="values"):
-        event['messages'][-1].pretty_print()
+    print_updates(list(graph.stream(None, to_replay.config, stream_mode="updates")))
 
-    print("-" * 70)
+    print(_RULE)
     print("\n✅ Replay complete!")
     print("\n💡 Note: Graph re-executed from the checkpoint with same inputs")
 
@@ -208,9 +303,8 @@ def run_fork_example(all_states):
     - Message ID for overwriting vs appending
     - Multiple timelines coexisting
     """
-    print("\n" + "="*70)
-    print("EXAMPLE 3: Forking - Creating Alternate Timeline")
-    print("="*70)
+    graph = get_time_travel_graph()
+    banner("EXAMPLE 3: Forking - Creating Alternate Timeline")
 
     # Select checkpoint to fork from
     to_fork = all_states[-2]
@@ -225,7 +319,7 @@ def run_fork_example(all_states):
     print(f"   New input: 'Multiply 5 and 3'")
     print(f"   Using same message ID → will OVERWRITE not APPEND")
 
-    fork_config = graph.update_state(
+    [fork_config] = fork_checkpoint(
         to_fork.config,
         {
             "messages": [
@@ -240,21 +334,20 @@ def run_fork_example(all_states):
     print(f"\n✅ Fork created!")
     print(f"   New checkpoint ID: {fork_config['configurable']['checkpoint_id'][:20]}...")
 
-    # Verify the fork
-    thread = {"configurable": {"thread_id": to_fork.config['configurable']['thread_id']}}
-    current_state = graph.get_state(thread)
+    # Verify the fork (read the fork checkpoint itself, not the thread's
+    # latest checkpoint, which another timeline may have moved on)
+    current_state = graph.get_state(fork_config)
 
     print(f"\n🔍 Current state after fork:")
     print(f"   Input changed to: '{current_state.values['messages'][0].content}'")
 
     # Execute the fork
     print("\n▶️ Executing forked timeline...")
-    print("-" * 70)
+    print(_RULE)
 
-    for event in graph.stream(None, fork_config, stream_mode="values"):
-        event['messages'][-1].pretty_print()
+    print_updates(list(graph.stream(None, fork_config, stream_mode="updates")))
 
-    print("-" * 70)
+    print(_RULE)
     print("\n✅ Fork execution complete!")
     print("\n💡 Note: Created NEW timeline - original still exists in history!")
 
@@ -263,7 +356,7 @@ def run_fork_example(all_states):
 # PART 4: ADVANCED - MULTIPLE FORKS
 # =============================================================================
 
-def run_multiple_forks_example():
+async def run_multiple_forks_example():
     """
     Example 4: Create multiple forks from same checkpoint.
 
@@ -271,75 +364,56 @@ def run_multiple_forks_example():
     - Multiple alternate timelines
     - A/B testing scenarios
     - Comparing different approaches
+    - Running independent forks concurrently
     """
-    print("\n" + "="*70)
-    print("EXAMPLE 4: Multiple Forks (A/B Testing)")
-    print("="*70)
+    graph = get_time_travel_graph()
+    banner("EXAMPLE 4: Multiple Forks (A/B Testing)")
 
     # Fresh execution
     initial_input = {"messages": HumanMessage(content="Multiply 2 and 2")}
-    thread = {"configurable": {"thread_id": "2"}}
+    thread = THREADS["2"]
 
     print("\n📍 Running original execution...")
-    for event in graph.stream(initial_input, thread, stream_mode="values"):
-        pass  # Silent execution
+    graph.invoke(initial_input, thread)  # Silent execution
 
     # Get checkpoint to fork from
-    all_states = list(graph.get_state_history(thread))
-    base_checkpoint = all_states[-2]
+    base_checkpoint = get_input_checkpoint(thread)
 
     print(f"\n✓ Base execution complete")
     print(f"   Input: 'Multiply 2 and 2'")
     print(f"   Result: 4")
 
-    # Fork A: Different operation
-    print(f"\n🔀 Creating Fork A: 'Add 10 and 5'")
-    fork_a_config = graph.update_state(
-        base_checkpoint.config,
-        {
-            "messages": [
-                HumanMessage(
-                    content='Add 10 and 5',
-                    id=base_checkpoint.values["messages"][0].id
-                )
-            ]
-        }
+    # Replacement inputs for both forks, built once up front. Each reuses
+    # the original message ID so it overwrites the input instead of
+    # appending to it.
+    base_id = base_checkpoint.values["messages"][0].id
+    fork_a_input, fork_b_input = (
+        {"messages": [HumanMessage(content=content, id=base_id)]}
+        for content in ("Add 10 and 5", "Divide 100 by 5")
     )
 
-    print("▶️ Executing Fork A...")
-    for event in graph.stream(None, fork_a_config, stream_mode="values"):
-        pass
-
-    fork_a_state = graph.get_state(thread)
-    fork_a_result = fork_a_state.values['messages'][-1].content
-    print(f"✅ Fork A Result: {fork_a_result}")
-
-    # Fork B: Another different operation
-    print(f"\n🔀 Creating Fork B: 'Divide 100 by 5'")
-    fork_b_config = graph.update_state(
-        base_checkpoint.config,
-        {
-            "messages": [
-                HumanMessage(
-                    content='Divide 100 by 5',
-                    id=base_checkpoint.values["messages"][0].id
-                )
-            ]
-        }
+    # Fork A: Different operation / Fork B: Another different operation
+    print(f"\n🔀 Creating Fork A: 'Add 10 and 5'")
+    print(f"🔀 Creating Fork B: 'Divide 100 by 5'")
+    fork_a_config, fork_b_config = fork_checkpoint(
+        base_checkpoint.config, fork_a_input, fork_b_input
     )
 
-    print("▶️ Executing Fork B...")
-    for event in graph.stream(None, fork_b_config, stream_mode="values"):
-        pass
+    # Both forks branch from the same checkpoint and don't depend on each
+    # other, so their LLM round trips can overlap
+    print("\n▶️ Executing Fork A and Fork B concurrently...")
+    fork_a_state, fork_b_state = await asyncio.gather(
+        graph.ainvoke(None, fork_a_config),
+        graph.ainvoke(None, fork_b_config),
+    )
 
-    fork_b_state = graph.get_state(thread)
-    fork_b_result = fork_b_state.values['messages'][-1].content
+    fork_a_result = fork_a_state['messages'][-1].content
+    fork_b_result = fork_b_state['messages'][-1].content
+    print(f"✅ Fork A Result: {fork_a_result}")
     print(f"✅ Fork B Result: {fork_b_result}")
 
     # Summary
-    print("\n" + "="*70)
-    print("📊 SUMMARY: Three Timelines from One Checkpoint")
-    print("="*70)
+    banner("📊 SUMMARY: Three Timelines from One Checkpoint")
     print(f"\n  Original: 'Multiply 2 and 2' → 4")
     print(f"  Fork A:   'Add 10 and 5' → 15")
     print(f"  Fork B:   'Divide 100 by 5' → 20")
@@ -360,13 +434,12 @@ def run_error_recovery_example():
     - Correcting and continuing
     - Production-ready recovery pattern
     """
-    print("\n" + "="*70)
-    print("EXAMPLE 5: Error Recovery Pattern")
-    print("="*70)
+    graph = get_time_travel_graph()
+    banner("EXAMPLE 5: Error Recovery Pattern")
 
     # Simulate problematic execution
     initial_input = {"messages": HumanMessage(content="Divide 10 by 0")}
-    thread = {"configurable": {"thread_id": "3"}}
+    thread = THREADS["3"]
 
     print("\n📍 Simulating problematic request...")
     print("   Request: 'Divide 10 by 0'")
@@ -374,8 +447,7 @@ def run_error_recovery_example():
 
     # In real scenario, this might fail or produce unexpected result
     try:
-        for event in graph.stream(initial_input, thread, stream_mode="values"):
-            pass
+        graph.invoke(initial_input, thread)
 
         print("\n⚠️ Execution completed but result may be problematic")
     except Exception as e:
@@ -387,13 +459,11 @@ def run_error_recovery_example():
     print("   2. Fork with corrected input")
     print("   3. Continue execution")
 
-    all_states = list(graph.get_state_history(thread))
-    if all_states:
-        before_error = all_states[-2]
-
+    before_error = get_input_checkpoint(thread)
+    if before_error is not None:
         print(f"\n✏️ Correcting input to: 'Divide 10 by 2'")
 
-        recovery_config = graph.update_state(
+        [recovery_config] = fork_checkpoint(
             before_error.config,
             {
                 "messages": [
@@ -406,8 +476,7 @@ def run_error_recovery_example():
         )
 
         print("\n▶️ Executing recovery...")
-        for event in graph.stream(None, recovery_config, stream_mode="values"):
-            event['messages'][-1].pretty_print()
+        print_updates(list(graph.stream(None, recovery_config, stream_mode="updates")))
 
         print("\n✅ Recovery successful! Problem avoided.")
 
@@ -416,13 +485,7 @@ def run_error_recovery_example():
 # KEY LEARNINGS
 # =============================================================================
 
-def print_key_concepts():
-    """Print key concepts for time travel."""
-    print("\n" + "="*70)
-    print("📚 KEY CONCEPTS: Time Travel")
-    print("="*70)
-
-    concepts = """
+_KEY_CONCEPTS: Final[str] = """
     1. CHECKPOINTS ARE SAVE POINTS:
        - Every step creates a checkpoint
        - Complete state snapshot saved
@@ -485,16 +548,16 @@ def print_key_concepts():
         ✓ Checkpoint IDs are unique
         ✓ Parent-child relationships tracked
     """
-    print(concepts)
 
 
-def print_comparison_table():
-    """Print comparison of time travel operations."""
-    print("\n" + "="*70)
-    print("📊 COMPARISON: Time Travel Operations")
-    print("="*70)
+def print_key_concepts():
+    """Print key concepts for time travel."""
+    banner("📚 KEY CONCEPTS: Time Travel")
+
+    print(_KEY_CONCEPTS)
 
-    comparison = """
+
+_COMPARISON_TABLE: Final[str] = """
     ┌─────────────────┬──────────────────┬──────────────────────┐
     │   Operation     │   State Change   │   Use Case           │
     ├─────────────────┼──────────────────┼──────────────────────┤
@@ -518,25 +581,41 @@ def print_comparison_table():
     - Creates NEW checkpoint branch
     - Good for: corrections, alternatives, recovery
     """
-    print(comparison)
+
+
+def print_comparison_table():
+    """Print comparison of time travel operations."""
+    banner("📊 COMPARISON: Time Travel Operations")
+
+    print(_COMPARISON_TABLE)
 
 
 # =============================================================================
-# MAIN EXECUTION
+# RUNNING THE EXAMPLES
 # =============================================================================
 
-if __name__ == "__main__":
-    print("\n" + "🚀"*35)
-    print("MODULE 3 - LESSON 4: TIME TRAVEL")
-    print("🚀"*35)
-    print("\n💡 Concept: Like Git for your agent execution!")
-    print("   - Browse history")
-    print("   - Replay any checkpoint")
-    print("   - Fork and create alternate timelines")
+async def main():
+    """
+    Run the five examples.
 
+    Examples 2-5 only depend on the history returned by example 1, so with
+    DEMO_PARALLEL=1 they run concurrently and their LLM round trips overlap.
+    Their output then interleaves, so the default is to run them in order.
+    The sync examples run in worker threads, so they don't block the event
+    loop.
+    """
     # Part 1: Browse history
     all_states = run_browsing_history_example()
 
+    if os.environ.get("DEMO_PARALLEL"):
+        await asyncio.gather(
+            asyncio.to_thread(run_replay_example, all_states),
+            asyncio.to_thread(run_fork_example, all_states),
+            run_multiple_forks_example(),
+            asyncio.to_thread(run_error_recovery_example),
+        )
+        return
+
     # Part 2: Replay
     run_replay_example(all_states)
 
@@ -544,18 +623,30 @@ if __name__ == "__main__":
     run_fork_example(all_states)
 
     # Part 4: Multiple forks
-    run_multiple_forks_example()
+    await run_multiple_forks_example()
 
     # Part 5: Error recovery
     run_error_recovery_example()
 
+
+# =============================================================================
+# MAIN EXECUTION
+# =============================================================================
+
+if __name__ == "__main__":
+    banner("MODULE 3 - LESSON 4: TIME TRAVEL", _ROCKETS)
+    print("\n💡 Concept: Like Git for your agent execution!")
+    print("   - Browse history")
+    print("   - Replay any checkpoint")
+    print("   - Fork and create alternate timelines")
+
+    asyncio.run(main())
+
     # Show key concepts
     print_key_concepts()
     print_comparison_table()
 
-    print("\n" + "="*70)
-    print("✅ Module 3, Lesson 4 Complete!")
-    print("="*70)
+    banner("✅ Module 3, Lesson 4 Complete!")
     print("\n🎓 Achievement Unlocked: Time Travel Master!")
     print("\n📖 Module 3 Complete! Next: Module 4 - Parallelization")
     print()
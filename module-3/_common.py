@@ -0,0 +1,238 @@
+"""
+Module 3 - Shared Helpers
+
+Tools, the tools-bound LLM, an offline stand-in model, the system prompt,
+and checkpointer/streaming/output helpers shared by the Module 3 lessons.
+
+bind_tools() introspects every tool signature and builds the OpenAI
+function schema. Caching the bound model by tool names means the lessons
+(and any notebook that imports several of them) pay that cost once per
+process instead of once per module.
+
+Author: Klement G
+Date: 2026-01-13
+Course: LangChain Academy - Introduction to LangGraph
+"""
+
+import functools
+import re
+import sys
+from collections import OrderedDict
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.checkpoint.memory import MemorySaver
+
+
+# =============================================================================
+# TOOLS DEFINITION
+# =============================================================================
+
+def multiply(a: int, b: int) -> int:
+    """
+    Multiply a and b.
+
+    Args:
+        a: first int
+        b: second int
+
+    Returns:
+        Product of a and b
+    """
+    return a * b
+
+
+def add(a: int, b: int) -> int:
+    """
+    Adds a and b.
+
+    Args:
+        a: first int
+        b: second int
+
+    Returns:
+        Sum of a and b
+    """
+    return a + b
+
+
+def divide(a: int, b: int) -> float:
+    """
+    Divide a by b.
+
+    Args:
+        a: first int
+        b: second int
+
+    Returns:
+        Division result
+    """
+    return a / b
+
+
+TOOLS_BY_NAME = {
+    "add": add,
+    "multiply": multiply,
+    "divide": divide,
+}
+
+
+def _resolve(tool_names: tuple) -> list:
+    """Map tool names to the tool functions defined above."""
+    return [TOOLS_BY_NAME[name] for name in tool_names]
+
+
+# =============================================================================
+# LLM SETUP
+# =============================================================================
+
+@functools.cache
+def get_llm_with_tools(tool_names: tuple, offline: bool = False):
+    """
+    Return a ChatOpenAI model bound to the named tools.
+
+    The result is cached for the lifetime of the process, keyed by the
+    tuple of tool names, so repeated imports share one bound Runnable.
+
+    Args:
+        tool_names: Tuple of names from TOOLS_BY_NAME
+        offline: Use ArithmeticFakeChatModel instead of ChatOpenAI
+
+    Returns:
+        Chat model runnable with the tools bound
+    """
+    if offline:
+        return ArithmeticFakeChatModel().bind_tools(_resolve(tool_names))
+
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(model="gpt-4o").bind_tools(_resolve(tool_names))
+
+
+# "Multiply 2 and 3", "Divide 100 by 5", ... -> (operation, a, b)
+_REQUEST_PATTERN = re.compile(r"\b(add|multiply|divide)\b\D*?(-?\d+)\D+?(-?\d+)", re.IGNORECASE)
+
+
+class ArithmeticFakeChatModel(BaseChatModel):
+    """
+    Offline stand-in for ChatOpenAI that answers the lessons' arithmetic prompts.
+
+    It reads the latest human request and emits the matching add/multiply/
+    divide tool call. Once the tool result is in the conversation it replies
+    with that result. Responses are deterministic, so checkpoint demos
+    reproduce exactly and run without any network calls.
+    """
+
+    @property
+    def _llm_type(self) -> str:
+        return "arithmetic-fake"
+
+    def bind_tools(self, tools, **kwargs):
+        """Tools are matched by name in the response, so binding is a no-op."""
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    def _respond(self, messages):
+        """Build the next assistant message for the conversation."""
+        last = messages[-1]
+        if isinstance(last, ToolMessage):
+            return AIMessage(content=f"The result is {last.content}.")
+
+        request = next(
+            (m.content for m in reversed(messages) if isinstance(m, HumanMessage)), ""
+        )
+        match = _REQUEST_PATTERN.search(request)
+        if match is None:
+            return AIMessage(content="I can add, multiply or divide two numbers.")
+
+        operation = match.group(1).lower()
+        a, b = int(match.group(2)), int(match.group(3))
+        return AIMessage(
+            content="",
+            tool_calls=[{
+                "name": operation,
+                "args": {"a": a, "b": b},
+                "id": f"call_{operation}_{a}_{b}",
+            }],
+        )
+
+
+# System message for the assistant. Built once and shared by every lesson;
+# it is never mutated, so all graphs can prepend the same instance.
+sys_msg = SystemMessage(
+    content="You are a helpful assistant tasked with performing arithmetic on a set of inputs."
+)
+
+
+# =============================================================================
+# CHECKPOINTER
+# =============================================================================
+
+class BoundedMemorySaver(MemorySaver):
+    """
+    MemorySaver that keeps checkpoints for at most max_threads threads.
+
+    A plain MemorySaver grows forever. When the lessons are re-run in a
+    long-lived process (e.g. a Jupyter kernel), every run adds checkpoints
+    for threads "1", "2", ... that are never read again. This saver tracks
+    threads in least-recently-written order and deletes the oldest thread
+    once the cap is exceeded.
+
+    Args:
+        max_threads: Number of threads to keep checkpoints for
+    """
+
+    def __init__(self, max_threads: int = 16):
+        super().__init__()
+        self._threads = OrderedDict()
+        self._max_threads = max_threads
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = config["configurable"]["thread_id"]
+        self._threads[thread_id] = None
+        self._threads.move_to_end(thread_id)
+        if len(self._threads) > self._max_threads:
+            oldest, _ = self._threads.popitem(last=False)
+            self.delete_thread(oldest)
+        return super().put(config, checkpoint, metadata, new_versions)
+
+
+# =============================================================================
+# STREAMING HELPERS
+# =============================================================================
+
+def tail(stream):
+    """
+    Yield the last message of each event from a stream_mode="values" stream.
+
+    Lets the lessons iterate messages directly instead of indexing
+    event['messages'][-1] at every call site.
+
+    Args:
+        stream: Iterator returned by graph.stream(..., stream_mode="values")
+
+    Yields:
+        The newest message in each state snapshot
+    """
+    for event in stream:
+        yield event["messages"][-1]
+
+
+# =============================================================================
+# OUTPUT HELPERS
+# =============================================================================
+
+def banner(title: str, sep: str = "=" * 70) -> None:
+    """
+    Print a title framed by separator lines.
+
+    The three lines go out in a single write instead of three print calls.
+
+    Args:
+        title: Text between the separators
+        sep: Separator line
+    """
+    sys.stdout.write(f"\n{sep}\n{title}\n{sep}\n")
@@ -23,14 +23,34 @@ Date: 2026-01-14
 Course: LangChain Academy - Introduction to LangGraph
 """
 
+import asyncio
+import functools
+import heapq
+import logging
 import operator
+import os
+import sys
+import time
+from collections import deque
 from typing import Any, List, Annotated
 from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, START, END
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.tools import ToolException
 from langchain_community.document_loaders import WikipediaLoader
 from langchain_tavily import TavilySearch
+from openai import OpenAIError
+from wikipedia.exceptions import WikipediaException
+
+from _common import banner
+
+_ROCKETS = "🚀" * 35
+_BAR = "=" * 70
+
+
+# Node progress goes through logging; __main__ sets it up to print at INFO
+logger = logging.getLogger(__name__)
 
 
 # =============================================================================
@@ -43,26 +63,27 @@ class SimpleState(TypedDict):
 
 
 class ReturnNodeValue:
-    """Helper class that returns a node's identifier to state"""
+    """
+    Helper class that returns a node's identifier to state.
+
+    The update is the same on every call, so it is built once. LangGraph
+    only reads node updates (reducers extend the channel's own list), so
+    returning the same dict each time is safe.
+    """
+    __slots__ = ("_value", "_update")
+
     def __init__(self, node_secret: str):
         self._value = node_secret
+        self._update = {"state": [node_secret]}
 
     def __call__(self, state: SimpleState) -> Any:
-        print(f"Adding {self._value} to {state['state']}")
-        return {"state": [self._value]}
-
-
-def run_linear_graph_example():
-    """
-    Example 1: Linear graph (no parallelization).
+        logger.info("Adding %s to %s", self._value, state['state'])
+        return self._update
 
-    Flow: START → a → b → c → d → END
-    Each node overwrites state sequentially.
-    """
-    print("\n" + "="*70)
-    print("EXAMPLE 1: Linear Graph (Sequential)")
-    print("="*70)
 
+@functools.cache
+def get_linear_graph():
+    """Compile the Example 1 graph (START → a → b → c → d → END) once."""
     builder = StateGraph(SimpleState)
 
     # Add nodes
@@ -78,31 +99,33 @@ def run_linear_graph_example():
     builder.add_edge("c", "d")
     builder.add_edge("d", END)
 
-    graph = builder.compile()
+    return builder.compile()
+
+
+async def run_linear_graph_example():
+    """
+    Example 1: Linear graph (no parallelization).
+
+    Flow: START → a → b → c → d → END
+    Each node overwrites state sequentially.
+    """
+    banner("EXAMPLE 1: Linear Graph (Sequential)")
+
+    graph = get_linear_graph()
 
     print("\n📊 Graph Structure:")
     print("   START → a → b → c → d → END")
 
     print("\n▶️ Running graph...")
-    result = graph.invoke({"state": []})
+    result = await graph.ainvoke({"state": []})
 
     print(f"\n✅ Final Result: {result['state']}")
     print("   Each node overwrites the previous state")
 
 
-def run_parallel_without_reducer_example():
-    """
-    Example 2: Parallel execution WITHOUT reducer (FAILS).
-
-    Flow: START → a → [b, c] → d → END
-
-    This will fail because both b and c try to write to 'state'
-    in the same step without a reducer to combine them.
-    """
-    print("\n" + "="*70)
-    print("EXAMPLE 2: Parallel Without Reducer ❌ FAILS")
-    print("="*70)
-
+@functools.cache
+def get_parallel_graph_without_reducer():
+    """Compile the Example 2 fan-out/fan-in graph (no reducer) once."""
     builder = StateGraph(SimpleState)
 
     builder.add_node("a", ReturnNodeValue("I'm A"))
@@ -120,17 +143,33 @@ def run_parallel_without_reducer_example():
     builder.add_edge("c", "d")
     builder.add_edge("d", END)
 
-    graph = builder.compile()
+    return builder.compile()
 
-    print("\n📊 Graph Structure:")
-    print("          ┌─→ b ─┐")
-    print("   START → a     ├→ d → END")
-    print("          └─→ c ─┘")
+
+async def run_parallel_without_reducer_example():
+    """
+    Example 2: Parallel execution WITHOUT reducer (FAILS).
+
+    Flow: START → a → [b, c] → d → END
+
+    This will fail because both b and c try to write to 'state'
+    in the same step without a reducer to combine them.
+    """
+    banner("EXAMPLE 2: Parallel Without Reducer ❌ FAILS")
+
+    graph = get_parallel_graph_without_reducer()
+
+    print(
+        "\n📊 Graph Structure:\n"
+        "          ┌─→ b ─┐\n"
+        "   START → a     ├→ d → END\n"
+        "          └─→ c ─┘"
+    )
 
     print("\n▶️ Attempting to run graph...")
 
     try:
-        graph.invoke({"state": []})
+        await graph.ainvoke({"state": []})
         print("\n✅ Success (unexpected!)")
     except Exception as e:
         print(f"\n❌ Error (expected): {str(e)[:100]}...")
@@ -138,16 +177,9 @@ def run_parallel_without_reducer_example():
         print("   Solution: Use a reducer to combine parallel writes!")
 
 
-def run_parallel_with_reducer_example():
-    """
-    Example 3: Parallel execution WITH reducer (SUCCESS).
-
-    Using operator.add as reducer allows combining parallel writes.
-    """
-    print("\n" + "="*70)
-    print("EXAMPLE 3: Parallel With Reducer ✅ SUCCESS")
-    print("="*70)
-
+@functools.cache
+def get_parallel_graph_with_reducer():
+    """Compile the Example 3 fan-out/fan-in graph (with reducer) once."""
     class StateWithReducer(TypedDict):
         # operator.add concatenates lists!
         state: Annotated[list, operator.add]
@@ -167,35 +199,37 @@ def run_parallel_with_reducer_example():
     builder.add_edge("c", "d")
     builder.add_edge("d", END)
 
-    graph = builder.compile()
+    return builder.compile()
 
-    print("\n📊 Graph Structure:")
-    print("          ┌─→ b ─┐")
-    print("   START → a     ├→ d → END")
-    print("          └─→ c ─┘")
+
+async def run_parallel_with_reducer_example():
+    """
+    Example 3: Parallel execution WITH reducer (SUCCESS).
+
+    Using operator.add as reducer allows combining parallel writes.
+    """
+    banner("EXAMPLE 3: Parallel With Reducer ✅ SUCCESS")
+
+    graph = get_parallel_graph_with_reducer()
+
+    print(
+        "\n📊 Graph Structure:\n"
+        "          ┌─→ b ─┐\n"
+        "   START → a     ├→ d → END\n"
+        "          └─→ c ─┘"
+    )
     print("\n💡 State has reducer: Annotated[list, operator.add]")
 
     print("\n▶️ Running graph...")
-    result = graph.invoke({"state": []})
+    result = await graph.ainvoke({"state": []})
 
     print(f"\n✅ Final Result: {result['state']}")
     print("   All values preserved! Reducer combined parallel writes.")
 
 
-def run_uneven_parallel_paths_example():
-    """
-    Example 4: Parallel paths with different lengths.
-
-    One path: a → b → b2
-    Other path: a → c
-    Both converge at d
-
-    The graph waits for ALL parallel paths to complete.
-    """
-    print("\n" + "="*70)
-    print("EXAMPLE 4: Uneven Parallel Paths")
-    print("="*70)
-
+@functools.cache
+def get_uneven_paths_graph():
+    """Compile the Example 4 uneven-paths graph once."""
     class StateWithReducer(TypedDict):
         state: Annotated[list, operator.add]
 
@@ -214,40 +248,54 @@ def run_uneven_parallel_paths_example():
     builder.add_edge(["b2", "c"], "d")  # Wait for BOTH!
     builder.add_edge("d", END)
 
-    graph = builder.compile()
+    return builder.compile()
 
-    print("\n📊 Graph Structure:")
-    print("          ┌─→ b → b2 ─┐")
-    print("   START → a          ├→ d → END")
-    print("          └─→ c ──────┘")
+
+async def run_uneven_parallel_paths_example():
+    """
+    Example 4: Parallel paths with different lengths.
+
+    One path: a → b → b2
+    Other path: a → c
+    Both converge at d
+
+    The graph waits for ALL parallel paths to complete.
+    """
+    banner("EXAMPLE 4: Uneven Parallel Paths")
+
+    graph = get_uneven_paths_graph()
+
+    print(
+        "\n📊 Graph Structure:\n"
+        "          ┌─→ b → b2 ─┐\n"
+        "   START → a          ├→ d → END\n"
+        "          └─→ c ──────┘"
+    )
     print("\n💡 d waits for BOTH b2 AND c to complete")
 
     print("\n▶️ Running graph...")
-    result = graph.invoke({"state": []})
+    result = await graph.ainvoke({"state": []})
 
     print(f"\n✅ Final Result: {result['state']}")
     print("   b2 and c both completed before d ran")
 
 
-def run_custom_reducer_example():
-    """
-    Example 5: Custom reducer for sorting.
-
-    By default, parallel updates happen in non-deterministic order.
-    Custom reducer allows control over ordering.
-    """
-    print("\n" + "="*70)
-    print("EXAMPLE 5: Custom Reducer (Sorting)")
-    print("="*70)
-
+@functools.cache
+def get_sorted_paths_graph():
+    """Compile the Example 5 uneven-paths graph with sorting reducer once."""
     def sorting_reducer(left, right):
-        """Combines and sorts the values in a list"""
+        """
+        Combines and sorts the values in a list.
+
+        left is always sorted (it is the result of the previous merge),
+        so only the incoming values need sorting before a linear merge.
+        """
         if not isinstance(left, list):
             left = [left]
         if not isinstance(right, list):
             right = [right]
 
-        return sorted(left + right, reverse=False)
+        return list(heapq.merge(left, sorted(right)))
 
     class StateWithSorting(TypedDict):
         state: Annotated[list, sorting_reducer]
@@ -267,16 +315,30 @@ def run_custom_reducer_example():
     builder.add_edge(["b2", "c"], "d")
     builder.add_edge("d", END)
 
-    graph = builder.compile()
+    return builder.compile()
 
-    print("\n📊 Graph Structure:")
-    print("          ┌─→ b → b2 ─┐")
-    print("   START → a          ├→ d → END")
-    print("          └─→ c ──────┘")
+
+async def run_custom_reducer_example():
+    """
+    Example 5: Custom reducer for sorting.
+
+    By default, parallel updates happen in non-deterministic order.
+    Custom reducer allows control over ordering.
+    """
+    banner("EXAMPLE 5: Custom Reducer (Sorting)")
+
+    graph = get_sorted_paths_graph()
+
+    print(
+        "\n📊 Graph Structure:\n"
+        "          ┌─→ b → b2 ─┐\n"
+        "   START → a          ├→ d → END\n"
+        "          └─→ c ──────┘"
+    )
     print("\n💡 Custom sorting_reducer sorts all values alphabetically")
 
     print("\n▶️ Running graph...")
-    result = graph.invoke({"state": []})
+    result = await graph.ainvoke({"state": []})
 
     print(f"\n✅ Final Result: {result['state']}")
     print("   Values are sorted! Custom reducer controls ordering.")
@@ -286,74 +348,178 @@ def run_custom_reducer_example():
 # PART 2: REAL-WORLD APPLICATION - PARALLEL SEARCH
 # =============================================================================
 
+@functools.lru_cache(maxsize=4)
+def get_llm(model: str = "gpt-4o", temperature: float = 0) -> ChatOpenAI:
+    """
+    Return a shared ChatOpenAI client for the given settings.
+
+    Reusing the client keeps its HTTP connection pool alive between runs
+    instead of rebuilding it in every generate_answer call.
+    """
+    return ChatOpenAI(model=model, temperature=temperature)
+
+
+@functools.lru_cache(maxsize=1)
+def get_tavily_search() -> TavilySearch:
+    """Return a shared Tavily search tool (3 results per query)."""
+    return TavilySearch(max_results=3)
+
+
+# Upper bound on a single search call, in seconds
+SEARCH_TIMEOUT = 8.0
+
+
+class CircuitBreaker:
+    """
+    Skip a search source after repeated recent failures.
+
+    Once max_failures failures happened within window seconds, the
+    breaker is open and the search node returns its fallback without
+    touching the network. Old failures age out of the window, which
+    closes the breaker again.
+
+    Args:
+        max_failures: Failures within the window that open the breaker
+        window: Length of the window in seconds
+    """
+    __slots__ = ("_failures", "_max_failures", "_window")
+
+    def __init__(self, max_failures: int = 3, window: float = 60.0):
+        self._failures = deque()
+        self._max_failures = max_failures
+        self._window = window
+
+    def is_open(self) -> bool:
+        cutoff = time.monotonic() - self._window
+        while self._failures and self._failures[0] < cutoff:
+            self._failures.popleft()
+        return len(self._failures) >= self._max_failures
+
+    def record_failure(self) -> None:
+        self._failures.append(time.monotonic())
+
+
+# One breaker per search source
+_web_breaker = CircuitBreaker()
+_wikipedia_breaker = CircuitBreaker()
+
+
+def join_context(left: str, right: str) -> str:
+    """
+    Reducer that appends a search result to the context string.
+
+    Results are separated like the documents inside each result, so the
+    prompt gets one flat string instead of the repr of a list.
+    """
+    return f"{left}\n\n---\n\n{right}" if left else right
+
+
 class ResearchState(TypedDict):
     """State for research assistant with parallel search"""
     question: str
     answer: str
-    context: Annotated[list, operator.add]
+    context: Annotated[str, join_context]
 
 
-def search_web(state: ResearchState) -> dict:
+async def search_web(state: ResearchState) -> dict:
     """
     Retrieve documents from web search using Tavily.
 
-    This runs in parallel with search_wikipedia.
+    This runs in parallel with search_wikipedia. The node is a coroutine,
+    so while it awaits the Tavily request the event loop serves the
+    Wikipedia search.
     """
-    print("\n🌐 Searching web...")
+    logger.info("\n🌐 Searching web...")
+
+    if _web_breaker.is_open():
+        logger.warning("   ⚠️ Web search skipped: too many recent failures")
+        return {"context": "Web search unavailable"}
 
     try:
-        tavily_search = TavilySearch(max_results=3)
-        data = tavily_search.invoke({"query": state['question']})
+        tavily_search = get_tavily_search()
+        data = await asyncio.wait_for(
+            tavily_search.ainvoke({"query": state['question']}),
+            timeout=SEARCH_TIMEOUT,
+        )
+        # TavilySearch reports request failures as {"error": ...}
+        if "error" in data:
+            raise ToolException(str(data["error"]))
         search_docs = data.get("results", data)
 
-        formatted = "\n\n---\n\n".join([
+        formatted = "\n\n---\n\n".join(
             f'<Document href="{doc["url"]}">\n{doc["content"]}\n</Document>'
             for doc in search_docs
-        ])
+        )
 
-        print(f"   ✓ Found {len(search_docs)} web results")
-        return {"context": [formatted]}
+        logger.info("   ✓ Found %d web results", len(search_docs))
+        return {"context": formatted}
 
-    except Exception as e:
-        print(f"   ⚠️ Web search failed: {e}")
-        return {"context": ["Web search unavailable"]}
+    except asyncio.TimeoutError:
+        _web_breaker.record_failure()
+        logger.warning("   ⚠️ Web search timed out after %.0fs", SEARCH_TIMEOUT)
+        return {"context": "Web search unavailable"}
+
+    except (ToolException, ValueError, OSError) as e:
+        _web_breaker.record_failure()
+        logger.warning("   ⚠️ Web search failed: %s", e)
+        return {"context": "Web search unavailable"}
 
 
-def search_wikipedia(state: ResearchState) -> dict:
+async def search_wikipedia(state: ResearchState) -> dict:
     """
     Retrieve documents from Wikipedia.
 
-    This runs in parallel with search_web.
+    This runs in parallel with search_web. WikipediaLoader only has a
+    blocking load(), so it is run in a worker thread. Calling it directly
+    would stall the event loop and serialize the two searches. Clients
+    with a native async API (like TavilySearch.ainvoke) are awaited
+    directly instead.
     """
-    print("\n📚 Searching Wikipedia...")
+    logger.info("\n📚 Searching Wikipedia...")
+
+    if _wikipedia_breaker.is_open():
+        logger.warning("   ⚠️ Wikipedia search skipped: too many recent failures")
+        return {"context": "Wikipedia search unavailable"}
 
     try:
-        search_docs = WikipediaLoader(
+        loader = WikipediaLoader(
             query=state['question'],
             load_max_docs=2
-        ).load()
-
-        formatted = "\n\n---\n\n".join([
+        )
+        # Blocking network I/O: keep it off the event loop. On timeout the
+        # worker thread finishes in the background; its result is dropped.
+        search_docs = await asyncio.wait_for(
+            asyncio.to_thread(loader.load),
+            timeout=SEARCH_TIMEOUT,
+        )
+
+        formatted = "\n\n---\n\n".join(
             f'<Document source="{doc.metadata["source"]}" page="{doc.metadata.get("page", "")}">\n'
             f'{doc.page_content}\n</Document>'
             for doc in search_docs
-        ])
+        )
 
-        print(f"   ✓ Found {len(search_docs)} Wikipedia results")
-        return {"context": [formatted]}
+        logger.info("   ✓ Found %d Wikipedia results", len(search_docs))
+        return {"context": formatted}
 
-    except Exception as e:
-        print(f"   ⚠️ Wikipedia search failed: {e}")
-        return {"context": ["Wikipedia search unavailable"]}
+    except asyncio.TimeoutError:
+        _wikipedia_breaker.record_failure()
+        logger.warning("   ⚠️ Wikipedia search timed out after %.0fs", SEARCH_TIMEOUT)
+        return {"context": "Wikipedia search unavailable"}
 
+    except (WikipediaException, ValueError, OSError) as e:
+        _wikipedia_breaker.record_failure()
+        logger.warning("   ⚠️ Wikipedia search failed: %s", e)
+        return {"context": "Wikipedia search unavailable"}
 
-def generate_answer(state: ResearchState) -> dict:
+
+async def generate_answer(state: ResearchState) -> dict:
     """
     Generate answer using context from parallel searches.
 
     This node waits for BOTH search_web and search_wikipedia to complete.
     """
-    print("\n🤖 Generating answer...")
+    logger.info("\n🤖 Generating answer...")
 
     context = state["context"]
     question = state["question"]
@@ -361,30 +527,23 @@ def generate_answer(state: ResearchState) -> dict:
     # Create prompt
     prompt = f"Answer the question '{question}' using this context: {context}"
 
-    # Initialize LLM
-    llm = ChatOpenAI(model="gpt-4o", temperature=0)
+    # Shared LLM client
+    llm = get_llm()
 
     # Generate answer
-    answer = llm.invoke([
+    answer = await llm.ainvoke([
         SystemMessage(content=prompt),
         HumanMessage(content="Answer the question concisely.")
     ])
 
-    print("   ✓ Answer generated")
+    logger.info("   ✓ Answer generated")
 
     return {"answer": answer}
 
 
-def run_parallel_research_example():
-    """
-    Example 6: Real-world parallel research assistant.
-
-    Searches Wikipedia AND web simultaneously, then generates answer.
-    """
-    print("\n" + "="*70)
-    print("EXAMPLE 6: Parallel Research Assistant")
-    print("="*70)
-
+@functools.cache
+def get_research_graph():
+    """Compile the Example 6 parallel research graph once."""
     builder = StateGraph(ResearchState)
 
     # Add nodes
@@ -401,12 +560,28 @@ def run_parallel_research_example():
     builder.add_edge("search_web", "generate_answer")
     builder.add_edge("generate_answer", END)
 
-    graph = builder.compile()
+    return builder.compile()
 
-    print("\n📊 Graph Structure:")
-    print("          ┌─→ search_wikipedia ─┐")
-    print("   START ─┤                      ├→ generate_answer → END")
-    print("          └─→ search_web ────────┘")
+
+async def run_parallel_research_example():
+    """
+    Example 6: Real-world parallel research assistant.
+
+    Searches Wikipedia AND web simultaneously, then generates answer.
+
+    The graph is streamed with stream_mode="updates", so each search is
+    reported as soon as it finishes instead of after the whole run.
+    """
+    banner("EXAMPLE 6: Parallel Research Assistant")
+
+    graph = get_research_graph()
+
+    print(
+        "\n📊 Graph Structure:\n"
+        "          ┌─→ search_wikipedia ─┐\n"
+        "   START ─┤                      ├→ generate_answer → END\n"
+        "          └─→ search_web ────────┘"
+    )
     print("\n💡 Both searches run simultaneously for faster results")
 
     # Example question
@@ -415,17 +590,25 @@ def run_parallel_research_example():
     print(f"\n❓ Question: {question}")
     print("\n▶️ Running parallel research...")
 
-    result = graph.invoke({"question": question})
+    answer = None
+    async for update in graph.astream({"question": question}, stream_mode="updates"):
+        for node, values in update.items():
+            print(f"   ✓ {node} finished")
+            if node == "generate_answer":
+                answer = values["answer"]
 
-    print("\n" + "="*70)
-    print("📝 FINAL ANSWER")
-    print("="*70)
-    print(result['answer'].content)
+    banner("📝 FINAL ANSWER")
+    if answer is None:
+        print("⚠️ No answer was generated")
+        return
+    print(answer.content)
 
-    print("\n" + "="*70)
-    print("✅ Research Complete!")
-    print("   Both sources searched in parallel")
-    print("   Answer generated from combined context")
+    sys.stdout.write(
+        f"\n{_BAR}\n"
+        "✅ Research Complete!\n"
+        "   Both sources searched in parallel\n"
+        "   Answer generated from combined context\n"
+    )
 
 
 # =============================================================================
@@ -434,9 +617,7 @@ def run_parallel_research_example():
 
 def print_key_concepts():
     """Print key concepts for parallelization."""
-    print("\n" + "="*70)
-    print("📚 KEY CONCEPTS: Parallelization")
-    print("="*70)
+    banner("📚 KEY CONCEPTS: Parallelization")
 
     concepts = """
     1. FAN-OUT & FAN-IN PATTERN:
@@ -492,9 +673,7 @@ def print_key_concepts():
 
 def print_comparison_table():
     """Print comparison of sequential vs parallel execution."""
-    print("\n" + "="*70)
-    print("📊 COMPARISON: Sequential vs Parallel")
-    print("="*70)
+    banner("📊 COMPARISON: Sequential vs Parallel")
 
     comparison = """
     SEQUENTIAL EXECUTION:
@@ -527,27 +706,53 @@ def print_comparison_table():
 # MAIN EXECUTION
 # =============================================================================
 
+async def run_basic_examples():
+    """
+    Run the five basic examples (1-5).
+
+    The examples are independent, so with DEMO_PARALLEL=1 they run
+    concurrently. Their output then interleaves, so the default is to run
+    them in order. Example 2 catches its own expected error; any other
+    failure is reported without cancelling the other examples.
+    """
+    examples = (
+        run_linear_graph_example,
+        run_parallel_without_reducer_example,
+        run_parallel_with_reducer_example,
+        run_uneven_parallel_paths_example,
+        run_custom_reducer_example,
+    )
+
+    if os.environ.get("DEMO_PARALLEL"):
+        results = await asyncio.gather(
+            *(example() for example in examples), return_exceptions=True
+        )
+        for example, result in zip(examples, results):
+            if isinstance(result, Exception):
+                print(f"\n⚠️ {example.__name__} failed: {result}")
+        return
+
+    for example in examples:
+        await example()
+
+
 if __name__ == "__main__":
-    print("\n" + "🚀"*35)
-    print("MODULE 4 - LESSON 1: PARALLELIZATION")
-    print("🚀"*35)
+    # Only this lesson's logger prints INFO; library loggers stay quiet
+    logger.setLevel(logging.INFO)
+    logger.addHandler(logging.StreamHandler(sys.stdout))
+
+    banner("MODULE 4 - LESSON 1: PARALLELIZATION", _ROCKETS)
     print("\n💡 Concept: Run multiple nodes simultaneously for faster execution")
 
     # Basic examples
-    run_linear_graph_example()
-    run_parallel_without_reducer_example()
-    run_parallel_with_reducer_example()
-    run_uneven_parallel_paths_example()
-    run_custom_reducer_example()
+    asyncio.run(run_basic_examples())
 
     # Real-world example
-    print("\n" + "="*70)
-    print("🌟 REAL-WORLD APPLICATION")
-    print("="*70)
+    banner("🌟 REAL-WORLD APPLICATION")
 
     try:
-        run_parallel_research_example()
-    except Exception as e:
+        asyncio.run(run_parallel_research_example())
+    except (OpenAIError, ValueError) as e:
         print(f"\n⚠️ Research example requires API keys:")
         print(f"   - OPENAI_API_KEY")
         print(f"   - TAVILY_API_KEY")
@@ -557,8 +762,6 @@ if __name__ == "__main__":
     print_key_concepts()
     print_comparison_table()
 
-    print("\n" + "="*70)
-    print("✅ Module 4, Lesson 1 Complete!")
-    print("="*70)
+    banner("✅ Module 4, Lesson 1 Complete!")
     print("\n📖 Next: map_reduce.py - Process multiple items in parallel")
     print()
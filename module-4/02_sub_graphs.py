@@ -23,43 +23,74 @@ Date: 2026-01-14
 Course: LangChain Academy - Introduction to LangGraph
 """
 
+import asyncio
+import functools
+from dataclasses import dataclass
 from operator import add
-from typing import List, Optional, Annotated
+from typing import List, Optional, Annotated, Tuple
 from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, START, END
 
+from _common import banner
+
+_ROCKETS = "🚀" * 35
+
 
 # =============================================================================
 # DOMAIN MODELS
 # =============================================================================
 
-class Log(TypedDict):
-    """Structure for log entries"""
+@dataclass(slots=True, frozen=True)
+class Log:
+    """
+    Structure for log entries.
+
+    Slotted and frozen: each log is a compact record with fast attribute
+    reads, and it cannot be changed after it has been cleaned.
+    """
     id: str
     question: str
-    docs: Optional[List]
     answer: str
-    grade: Optional[int]
-    grader: Optional[str]
-    feedback: Optional[str]
+    docs: Optional[List] = None
+    grade: Optional[int] = None
+    grader: Optional[str] = None
+    feedback: Optional[str] = None
 
 
 # =============================================================================
 # SUB-GRAPH 1: FAILURE ANALYSIS
 # =============================================================================
 
+# Bound str.format methods for the processed-log markers, looked up once
+_FA_LOG_FORMAT = "failure-analysis-on-log-{}".format
+_QS_LOG_FORMAT = "summary-on-log-{}".format
+
+# Summary and processed logs for a run without failures
+_NO_FAILURES = ("No failures detected. All logs passed quality checks.", [])
+
+
 class FailureAnalysisState(TypedDict):
     """
     Internal state for Failure Analysis sub-graph.
 
     This is the FULL state available inside the sub-graph.
     """
-    cleaned_logs: List[Log]  # Input from parent
-    failures: List[Log]      # Internal state
+    graded_failures: Tuple[Log, ...]  # Input from parent
+    failures: Tuple[Log, ...]  # Internal state
     fa_summary: str          # Output to parent
     processed_logs: List[str]  # Output to parent
 
 
+class FailureAnalysisInputState(TypedDict):
+    """
+    Input state for Failure Analysis sub-graph.
+
+    Only these keys are taken from the parent graph, so the rest of the
+    parent state is never projected into the sub-graph.
+    """
+    graded_failures: Tuple[Log, ...]
+
+
 class FailureAnalysisOutputState(TypedDict):
     """
     Output state for Failure Analysis sub-graph.
@@ -75,16 +106,14 @@ def get_failures(state: FailureAnalysisState) -> dict:
     """
     Node: Extract logs that contain failures.
 
-    Filters logs to find those with grade < passing threshold.
+    The parent's clean_logs node already filtered the logs graded as
+    failures (grade == 0), so no scan of the full log list is needed here.
     """
     print("\n  🔍 [FA] Analyzing logs for failures...")
 
-    cleaned_logs = state["cleaned_logs"]
-
-    # Find logs with grade (indicating they were graded/reviewed)
-    failures = [log for log in cleaned_logs if "grade" in log and log["grade"] == 0]
+    failures = state["graded_failures"]
 
-    print(f"     Found {len(failures)} failures out of {len(cleaned_logs)} logs")
+    print(f"     Found {len(failures)} failures")
 
     return {"failures": failures}
 
@@ -100,12 +129,11 @@ def generate_fa_summary(state: FailureAnalysisState) -> dict:
     failures = state["failures"]
 
     if not failures:
-        fa_summary = "No failures detected. All logs passed quality checks."
-        processed_logs = []
+        fa_summary, processed_logs = _NO_FAILURES
     else:
         # In production: fa_summary = llm.invoke(f"Summarize these failures: {failures}")
         fa_summary = f"Found {len(failures)} failure(s). Common issues: Poor quality retrieval of documentation."
-        processed_logs = [f"failure-analysis-on-log-{failure['id']}" for failure in failures]
+        processed_logs = list(map(_FA_LOG_FORMAT, (failure.id for failure in failures)))
 
     print(f"     Summary: {fa_summary}")
     print(f"     Processed: {len(processed_logs)} logs")
@@ -126,6 +154,7 @@ def build_failure_analysis_subgraph() -> StateGraph:
 
     fa_builder = StateGraph(
         state_schema=FailureAnalysisState,
+        input_schema=FailureAnalysisInputState,  # Controls what's read
         output_schema=FailureAnalysisOutputState  # Controls what's returned
     )
 
@@ -143,6 +172,17 @@ def build_failure_analysis_subgraph() -> StateGraph:
     return fa_builder
 
 
+@functools.cache
+def get_failure_analysis_graph():
+    """
+    Compiled Failure Analysis sub-graph, built once per process.
+
+    Compiled graphs hold no run state, so every parent graph can share
+    the same instance.
+    """
+    return build_failure_analysis_subgraph().compile()
+
+
 # =============================================================================
 # SUB-GRAPH 2: QUESTION SUMMARIZATION
 # =============================================================================
@@ -153,12 +193,23 @@ class QuestionSummarizationState(TypedDict):
 
     This is the FULL state available inside the sub-graph.
     """
-    cleaned_logs: List[Log]  # Input from parent
+    questions: Tuple[str, ...]  # Input from parent
+    log_ids: Tuple[str, ...]    # Input from parent
     qs_summary: str          # Internal state
     report: str              # Output to parent
     processed_logs: List[str]  # Output to parent
 
 
+class QuestionSummarizationInputState(TypedDict):
+    """
+    Input state for Question Summarization sub-graph.
+
+    Only these keys are taken from the parent graph.
+    """
+    questions: Tuple[str, ...]
+    log_ids: Tuple[str, ...]
+
+
 class QuestionSummarizationOutputState(TypedDict):
     """
     Output state for Question Summarization sub-graph.
@@ -177,15 +228,13 @@ def generate_qs_summary(state: QuestionSummarizationState) -> dict:
     """
     print("\n  🔍 [QS] Analyzing questions...")
 
-    cleaned_logs = state["cleaned_logs"]
-
-    # Extract questions
-    questions = [log["question"] for log in cleaned_logs]
+    # Questions were extracted by the parent's clean_logs node
+    questions = state["questions"]
 
     # In production: qs_summary = llm.invoke(f"Summarize these questions: {questions}")
     qs_summary = f"Analyzed {len(questions)} questions. Common topics: Usage of ChatOllama and Chroma vector store."
 
-    processed_logs = [f"summary-on-log-{log['id']}" for log in cleaned_logs]
+    processed_logs = list(map(_QS_LOG_FORMAT, state["log_ids"]))
 
     print(f"     Summary: {qs_summary}")
     print(f"     Processed: {len(processed_logs)} logs")
@@ -226,6 +275,7 @@ def build_question_summarization_subgraph() -> StateGraph:
 
     qs_builder = StateGraph(
         state_schema=QuestionSummarizationState,
+        input_schema=QuestionSummarizationInputState,  # Controls what's read
         output_schema=QuestionSummarizationOutputState  # Controls what's returned
     )
 
@@ -243,6 +293,12 @@ def build_question_summarization_subgraph() -> StateGraph:
     return qs_builder
 
 
+@functools.cache
+def get_question_summarization_graph():
+    """Compiled Question Summarization sub-graph, built once per process."""
+    return build_question_summarization_subgraph().compile()
+
+
 # =============================================================================
 # PARENT GRAPH: LOG ANALYSIS SYSTEM
 # =============================================================================
@@ -252,13 +308,17 @@ class EntryGraphState(TypedDict):
     Parent graph state.
 
     Communication with sub-graphs happens through overlapping keys:
-    - cleaned_logs: Input TO both sub-graphs
+    - graded_failures: Input TO failure analysis sub-graph
+    - questions, log_ids: Input TO question summarization sub-graph
     - fa_summary: Output FROM failure analysis sub-graph
     - report: Output FROM question summarization sub-graph
     - processed_logs: Output FROM both sub-graphs (needs reducer!)
     """
     raw_logs: List[Log]
-    cleaned_logs: List[Log]
+    cleaned_logs: Tuple[Log, ...]
+    graded_failures: Tuple[Log, ...]
+    questions: Tuple[str, ...]
+    log_ids: Tuple[str, ...]
     fa_summary: str
     report: str
     processed_logs: Annotated[List[str], add]  # Reducer for parallel outputs
@@ -268,18 +328,31 @@ def clean_logs(state: EntryGraphState) -> dict:
     """
     Node: Clean and prepare raw logs.
 
-    This runs first and prepares data for sub-graphs.
+    This runs first and prepares data for sub-graphs. Besides the cleaned
+    logs it emits the narrow views each sub-graph reads, so the logs are
+    traversed once here instead of once per sub-graph.
     """
     print("\n🧹 Cleaning logs...")
 
     raw_logs = state["raw_logs"]
 
     # In production: cleaned_logs = data_cleaning_pipeline(raw_logs)
-    cleaned_logs = raw_logs  # Simplified for demo
+    # Cleaned logs are read-only from here on. Tuples of frozen Log records
+    # can be shared by both sub-graphs without either one changing them.
+    cleaned_logs = tuple(raw_logs)  # Simplified for demo
+
+    graded_failures = tuple(log for log in cleaned_logs if log.grade == 0)
+    questions = tuple(log.question for log in cleaned_logs)
+    log_ids = tuple(log.id for log in cleaned_logs)
 
     print(f"   ✓ Cleaned {len(cleaned_logs)} logs")
 
-    return {"cleaned_logs": cleaned_logs}
+    return {
+        "cleaned_logs": cleaned_logs,
+        "graded_failures": graded_failures,
+        "questions": questions,
+        "log_ids": log_ids,
+    }
 
 
 def build_entry_graph() -> StateGraph:
@@ -291,13 +364,11 @@ def build_entry_graph() -> StateGraph:
 
     The two sub-graphs run in PARALLEL!
     """
-    print("\n" + "="*70)
-    print("🏗️ Building Parent Graph with Sub-Graphs")
-    print("="*70)
+    banner("🏗️ Building Parent Graph with Sub-Graphs")
 
-    # Build sub-graphs
-    fa_graph = build_failure_analysis_subgraph().compile()
-    qs_graph = build_question_summarization_subgraph().compile()
+    # Compiled sub-graphs (cached after the first build)
+    fa_graph = get_failure_analysis_graph()
+    qs_graph = get_question_summarization_graph()
 
     # Build parent graph
     print("\n🏗️ Building Entry Graph...")
@@ -335,7 +406,7 @@ def build_entry_graph() -> StateGraph:
 # EXECUTION EXAMPLES
 # =============================================================================
 
-def run_basic_example():
+async def run_basic_example():
     """
     Example: Run the complete log analysis system.
 
@@ -343,10 +414,12 @@ def run_basic_example():
     - Parent graph coordinating sub-graphs
     - Parallel execution of sub-graphs
     - State communication through overlapping keys
+
+    The graph is driven with ainvoke: the async runtime schedules both
+    sub-graph nodes of the fan-out as concurrent tasks on the event loop,
+    so sub-graphs that await I/O (LLM calls, Slack) overlap.
     """
-    print("\n" + "="*70)
-    print("EXAMPLE: Log Analysis with Sub-Graphs")
-    print("="*70)
+    banner("EXAMPLE: Log Analysis with Sub-Graphs")
 
     # Build the complete system
     entry_graph = build_entry_graph()
@@ -387,16 +460,12 @@ def run_basic_example():
     print("     - Log 3: Question with success (grade=1)")
 
     # Run the graph
-    print("\n" + "="*70)
-    print("▶️ EXECUTING GRAPH")
-    print("="*70)
+    banner("▶️ EXECUTING GRAPH")
 
-    result = graph.invoke({"raw_logs": raw_logs})
+    result = await graph.ainvoke({"raw_logs": raw_logs})
 
     # Display results
-    print("\n" + "="*70)
-    print("📊 RESULTS")
-    print("="*70)
+    banner("📊 RESULTS")
 
     print(f"\n✅ Raw Logs: {len(result['raw_logs'])} logs")
     print(f"✅ Cleaned Logs: {len(result['cleaned_logs'])} logs")
@@ -408,12 +477,9 @@ def run_basic_example():
     print(f"   {result['report']}")
 
     print(f"\n📋 Processed Logs: {len(result['processed_logs'])} entries")
-    for log in result['processed_logs']:
-        print(f"   - {log}")
+    print("\n".join(f"   - {log}" for log in result['processed_logs']))
 
-    print("\n" + "="*70)
-    print("✅ Execution Complete!")
-    print("="*70)
+    banner("✅ Execution Complete!")
     print("\n💡 Notice:")
     print("   - Both sub-graphs ran in parallel")
     print("   - Each had its own internal state")
@@ -427,9 +493,7 @@ def run_basic_example():
 
 def print_key_concepts():
     """Print key concepts for sub-graphs."""
-    print("\n" + "="*70)
-    print("📚 KEY CONCEPTS: Sub-Graphs")
-    print("="*70)
+    banner("📚 KEY CONCEPTS: Sub-Graphs")
 
     concepts = """
     1. SUB-GRAPHS ARE MODULAR COMPONENTS:
@@ -463,11 +527,13 @@ def print_key_concepts():
        - Example: processed_logs with operator.add
        - Each sub-graph adds to same list
 
-    6. OUTPUT STATE SCHEMA:
+    6. INPUT & OUTPUT STATE SCHEMAS:
        StateGraph(
            state_schema=FullState,
+           input_schema=InputState,   # Only these keys read
            output_schema=OutputState  # Only these keys returned
        )
+       - Sub-graph only receives the keys it needs
        - Prevents returning unnecessary data
        - Cleaner parent state
        - Avoids reducer conflicts
@@ -496,12 +562,13 @@ def print_key_concepts():
 
     10. COMMUNICATION DIAGRAM:
 
-        Parent State: {cleaned_logs, fa_summary, report, processed_logs}
+        Parent State: {cleaned_logs, graded_failures, questions, log_ids,
+                       fa_summary, report, processed_logs}
                                     ↓
                     ┌───────────────────────────────┐
                     │                               │
               [FA Sub-Graph]              [QS Sub-Graph]
-              State: {cleaned_logs,       State: {cleaned_logs,
+              State: {graded_failures,    State: {questions, log_ids,
                       failures,                   qs_summary,
                       fa_summary,                 report,
                       processed_logs}             processed_logs}
@@ -515,9 +582,7 @@ def print_key_concepts():
 
 def print_comparison_table():
     """Print comparison of different graph patterns."""
-    print("\n" + "="*70)
-    print("📊 COMPARISON: Graph Patterns")
-    print("="*70)
+    banner("📊 COMPARISON: Graph Patterns")
 
     comparison = """
     SINGLE GRAPH (Modules 1-3):
@@ -565,22 +630,18 @@ def print_comparison_table():
 # =============================================================================
 
 if __name__ == "__main__":
-    print("\n" + "🚀"*35)
-    print("MODULE 4 - LESSON 2: SUB-GRAPHS")
-    print("🚀"*35)
+    banner("MODULE 4 - LESSON 2: SUB-GRAPHS", _ROCKETS)
     print("\n💡 Concept: Build modular, reusable graph components")
     print("   Think: Microservices for agents!")
 
     # Run main example
-    run_basic_example()
+    asyncio.run(run_basic_example())
 
     # Show key concepts
     print_key_concepts()
     print_comparison_table()
 
-    print("\n" + "="*70)
-    print("✅ Module 4, Lesson 2 Complete!")
-    print("="*70)
+    banner("✅ Module 4, Lesson 2 Complete!")
     print("\n🎓 Achievement Unlocked: Sub-Graph Architect!")
     print("\n📖 Next: Continue with remaining Module 4 lessons")
     print("   - Map-Reduce patterns")
@@ -21,50 +21,93 @@ REAL-WORLD USE CASES:
 from typing import TypedDict, Annotated, List
 from langgraph.graph import StateGraph, START, END
 from langgraph.constants import Send
+import functools
+import logging
 import operator
+import os
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from math import fsum
+from operator import itemgetter
+from statistics import fmean
+
+from _common import banner
+
+# Per-task progress from the map workers goes through logging; __main__
+# sets it up to print at INFO. Imported without that setup, the workers
+# skip the stdout writes, which would otherwise serialize the map stage.
+logger = logging.getLogger(__name__)
+
+# Items per Send(). The default of 1 is the classic one-task-per-item map.
+# For large inputs set MAP_BATCH_SIZE (e.g. 64) so each task processes a
+# batch and the scheduler dispatches far fewer tasks.
+MAP_BATCH_SIZE = max(1, int(os.environ.get("MAP_BATCH_SIZE", "1")))
+
+# Upper bound on map tasks running at once. LangGraph runs sync tasks on
+# a thread pool; once the workers make real LLM/API calls, capping it keeps
+# a large fan-out from starting one thread per Send and from exceeding the
+# provider's rate limit.
+MAP_MAX_CONCURRENCY = max(1, int(os.environ.get("MAP_MAX_CONCURRENCY", "32")))
+RUN_CONFIG = {"max_concurrency": MAP_MAX_CONCURRENCY}
+
+
+def batched(items: list, size: int = MAP_BATCH_SIZE) -> List[list]:
+    """Split items into consecutive batches of at most size items."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
 
 # ============================================================================
 # EXAMPLE 1: Basic Map-Reduce - Number Processing
 # ============================================================================
 
-print("=" * 70)
-print("EXAMPLE 1: Basic Map-Reduce - Processing Numbers")
-print("=" * 70)
-
 class BasicState(TypedDict):
     """State for basic map-reduce example"""
     numbers: List[int]                              # Input: List of numbers
     squared: Annotated[List[int], operator.add]     # Map output (REDUCER!)
     sum_of_squares: int                             # Reduce output
 
+@dataclass(slots=True, frozen=True)
+class NumberBatch:
+    """
+    Send() payload for square_number: just the batch, not BasicState
+
+    The payloads are slotted dataclasses: one small fixed-layout object
+    per task, read by attribute instead of dict lookup.
+    """
+    batch: List[int]
+
 def map_numbers(state: BasicState):
     """
-    MAP STEP: Create Send() for each number
+    MAP STEP: Create Send() for each batch of numbers
 
     This is where dynamic branching happens!
-    - For each number, create a Send() command
-    - Each Send() will invoke "square_number" with that number
+    - For each batch (one number by default), create a Send() command
+    - Each Send() will invoke "square_number" with that batch
     - All invocations run in PARALLEL
     """
     print(f"\n📤 MAP: Creating tasks for {len(state['numbers'])} numbers")
     return [
-        Send("square_number", {"number": num})
-        for num in state['numbers']
+        Send("square_number", NumberBatch(batch))
+        for batch in batched(state['numbers'])
     ]
 
-def square_number(state: BasicState):
+def square_number(state: NumberBatch):
     """
-    PROCESS STEP: Square one number
+    PROCESS STEP: Square one batch of numbers
 
-    This function runs ONCE for EACH number in parallel!
-    - Receives one number via state
-    - Processes it
-    - Returns result to 'squared' list (combined by reducer)
+    This function runs ONCE for EACH batch in parallel!
+    - Receives a batch of numbers via state
+    - Processes them
+    - Returns results to 'squared' list (combined by reducer)
     """
-    num = state['number']
-    result = num ** 2
-    print(f"  🔢 Processing: {num}^2 = {result}")
-    return {"squared": [result]}
+    batch = state.batch
+    # One comprehension for the whole batch; num * num skips the generic
+    # int.__pow__ path that num ** 2 goes through
+    squared = [num * num for num in batch]
+    if logger.isEnabledFor(logging.INFO):
+        for num, result in zip(batch, squared):
+            logger.info("  🔢 Processing: %d^2 = %d", num, result)
+    return {"squared": squared}
 
 def sum_squares(state: BasicState):
     """
@@ -78,70 +121,79 @@ def sum_squares(state: BasicState):
     print(f"\n✅ REDUCE: Sum of squares = {total}")
     return {"sum_of_squares": total}
 
-# Build graph
-builder_1 = StateGraph(BasicState)
-builder_1.add_node("square_number", square_number)
-builder_1.add_node("sum_squares", sum_squares)
+@functools.cache
+def get_basic_graph():
+    """Compile the Example 1 graph once, on first use."""
+    builder = StateGraph(BasicState)
+    builder.add_node("square_number", square_number)
+    builder.add_node("sum_squares", sum_squares)
+
+    # Dynamic branching from START
+    builder.add_conditional_edges(START, map_numbers)
 
-# Dynamic branching from START
-builder_1.add_conditional_edges(START, map_numbers)
+    # All square_number nodes feed into sum_squares
+    builder.add_edge("square_number", "sum_squares")
+    builder.add_edge("sum_squares", END)
 
-# All square_number nodes feed into sum_squares
-builder_1.add_edge("square_number", "sum_squares")
-builder_1.add_edge("sum_squares", END)
+    return builder.compile()
 
-graph_1 = builder_1.compile()
+def run_basic_example():
+    """Example 1: Square numbers in parallel and sum the squares."""
+    banner("EXAMPLE 1: Basic Map-Reduce - Processing Numbers")
 
-# Run example
-result_1 = graph_1.invoke({
-    "numbers": [1, 2, 3, 4, 5]
-})
+    result = get_basic_graph().invoke({
+        "numbers": [1, 2, 3, 4, 5]
+    }, RUN_CONFIG)
 
-print(f"\n🎯 FINAL RESULT:")
-print(f"   Input: {[1, 2, 3, 4, 5]}")
-print(f"   Squared: {result_1['squared']}")
-print(f"   Sum: {result_1['sum_of_squares']}")
+    print(f"\n🎯 FINAL RESULT:")
+    print(f"   Input: {[1, 2, 3, 4, 5]}")
+    print(f"   Squared: {result['squared']}")
+    print(f"   Sum: {result['sum_of_squares']}")
 
 # ============================================================================
 # EXAMPLE 2: Map-Reduce with Conditional Logic
 # ============================================================================
 
-print("\n" + "=" * 70)
-print("EXAMPLE 2: Map-Reduce with Filtering")
-print("=" * 70)
-
 class FilterState(TypedDict):
     """State with conditional processing"""
     items: List[str]
     processed: Annotated[List[str], operator.add]
     valid_count: int
 
+@dataclass(slots=True, frozen=True)
+class ItemBatch:
+    """Send() payload for process_item"""
+    batch: List[str]
+
 def map_items(state: FilterState):
-    """MAP: Create task for each item"""
+    """MAP: Create task for each batch of items"""
     print(f"\n📤 MAP: Creating tasks for {len(state['items'])} items")
     return [
-        Send("process_item", {"item": item})
-        for item in state['items']
+        Send("process_item", ItemBatch(batch))
+        for batch in batched(state['items'])
     ]
 
-def process_item(state: FilterState):
+def process_item(state: ItemBatch):
     """
-    PROCESS: Validate and transform item
+    PROCESS: Validate and transform a batch of items
 
     Conditional logic in map phase:
     - Only return valid items
     - Invalid items filtered out
     """
-    item = state['item']
-
-    # Conditional logic: Only process items longer than 3 chars
-    if len(item) > 3:
-        result = item.upper()
-        print(f"  ✅ Valid: '{item}' → '{result}'")
-        return {"processed": [result]}
-    else:
-        print(f"  ❌ Invalid: '{item}' (too short)")
-        return {"processed": []}  # Empty list = filtered out
+    batch = state.batch
+    # Conditional logic: Only process items longer than 3 chars. The filter
+    # and the upper-casing each run as one pass over the whole batch
+    valid = [item for item in batch if len(item) > 3]
+    processed = list(map(str.upper, valid))
+    if logger.isEnabledFor(logging.INFO):
+        for item, result in zip(valid, processed):
+            logger.info("  ✅ Valid: '%s' → '%s'", item, result)
+        for item in batch:
+            if len(item) <= 3:
+                logger.info("  ❌ Invalid: '%s' (too short)", item)
+
+    return {"processed": processed}  # Filtered-out items are simply absent
 
 def count_valid(state: FilterState):
     """REDUCE: Count valid items"""
@@ -149,74 +201,94 @@ def count_valid(state: FilterState):
     print(f"\n✅ REDUCE: {count} valid items processed")
     return {"valid_count": count}
 
-# Build graph
-builder_2 = StateGraph(FilterState)
-builder_2.add_node("process_item", process_item)
-builder_2.add_node("count_valid", count_valid)
-builder_2.add_conditional_edges(START, map_items)
-builder_2.add_edge("process_item", "count_valid")
-builder_2.add_edge("count_valid", END)
+@functools.cache
+def get_filter_graph():
+    """Compile the Example 2 graph once, on first use."""
+    builder = StateGraph(FilterState)
+    builder.add_node("process_item", process_item)
+    builder.add_node("count_valid", count_valid)
+    builder.add_conditional_edges(START, map_items)
+    builder.add_edge("process_item", "count_valid")
+    builder.add_edge("count_valid", END)
 
-graph_2 = builder_2.compile()
+    return builder.compile()
 
-# Run example
-result_2 = graph_2.invoke({
-    "items": ["cat", "elephant", "ox", "tiger", "ant", "bear"]
-})
+def run_filter_example():
+    """Example 2: Keep and upper-case only the items longer than 3 chars."""
+    banner("EXAMPLE 2: Map-Reduce with Filtering")
 
-print(f"\n🎯 FINAL RESULT:")
-print(f"   Input: {['cat', 'elephant', 'ox', 'tiger', 'ant', 'bear']}")
-print(f"   Valid (>3 chars): {result_2['processed']}")
-print(f"   Count: {result_2['valid_count']}")
+    result = get_filter_graph().invoke({
+        "items": ["cat", "elephant", "ox", "tiger", "ant", "bear"]
+    }, RUN_CONFIG)
+
+    print(f"\n🎯 FINAL RESULT:")
+    print(f"   Input: {['cat', 'elephant', 'ox', 'tiger', 'ant', 'bear']}")
+    print(f"   Valid (>3 chars): {result['processed']}")
+    print(f"   Count: {result['valid_count']}")
 
 # ============================================================================
 # EXAMPLE 3: Joke Generator - Multiple Topics (LLM Use Case)
 # ============================================================================
 
-print("\n" + "=" * 70)
-print("EXAMPLE 3: Joke Generator - Map-Reduce with Mock LLM")
-print("=" * 70)
-
 class JokeState(TypedDict):
     """State for joke generation"""
     topics: List[str]                               # Input topics
     jokes: Annotated[List[dict], operator.add]      # Generated jokes
     best_joke: dict                                 # Final selection
 
+@dataclass(slots=True, frozen=True)
+class TopicBatch:
+    """Send() payload for generate_joke"""
+    batch: List[str]
+
+# Mock LLM response (in real app, use OpenAI/Anthropic). Built once at
+# import with each joke's mock rating, instead of on every generate_joke call.
+_JOKES_DB = {
+    "cats": "Why did the cat sit on the computer? To keep an eye on the mouse!",
+    "programming": "Why do programmers prefer dark mode? Because light attracts bugs!",
+    "pizza": "Why did the pizza go to therapy? It had too many toppings to deal with!",
+    "coffee": "How does a programmer drink coffee? In Java!",
+    "dogs": "Why did the dog go to school? To get a little ruff education!"
+}
+# Topic keys are interned, so lookups with interned topics match by identity.
+_RATED_JOKES = {
+    sys.intern(topic): (text, len(text) % 10) for topic, text in _JOKES_DB.items()
+}
+
 def map_topics(state: JokeState):
-    """MAP: Create joke generation task for each topic"""
+    """MAP: Create joke generation task for each batch of topics"""
     print(f"\n📤 MAP: Generating jokes for {len(state['topics'])} topics")
+    # Intern each topic once here; every Send payload then carries the
+    # shared string that _RATED_JOKES is keyed by
+    topics = [sys.intern(topic) for topic in state['topics']]
     return [
-        Send("generate_joke", {"topic": topic})
-        for topic in state['topics']
+        Send("generate_joke", TopicBatch(batch))
+        for batch in batched(topics)
     ]
 
-def generate_joke(state: JokeState):
+def generate_joke(state: TopicBatch):
     """
-    PROCESS: Generate joke for one topic
+    PROCESS: Generate a joke for each topic in one batch
 
     In real implementation, this would call an LLM
     """
-    topic = state['topic']
-
-    # Mock LLM response (in real app, use OpenAI/Anthropic)
-    jokes_db = {
-        "cats": "Why did the cat sit on the computer? To keep an eye on the mouse!",
-        "programming": "Why do programmers prefer dark mode? Because light attracts bugs!",
-        "pizza": "Why did the pizza go to therapy? It had too many toppings to deal with!",
-        "coffee": "How does a programmer drink coffee? In Java!",
-        "dogs": "Why did the dog go to school? To get a little ruff education!"
-    }
-
-    joke_text = jokes_db.get(topic, f"I don't have a joke about {topic}!")
-    joke_data = {
-        "topic": topic,
-        "joke": joke_text,
-        "rating": len(joke_text) % 10  # Mock rating
-    }
-
-    print(f"  😄 Generated joke about '{topic}' (rating: {joke_data['rating']})")
-    return {"jokes": [joke_data]}
+    jokes = []
+    for topic in state.batch:
+        rated = _RATED_JOKES.get(topic)
+        if rated is None:
+            joke_text = f"I don't have a joke about {topic}!"
+            rated = (joke_text, len(joke_text) % 10)  # Mock rating
+        joke_text, rating = rated
+        joke_data = {
+            "topic": topic,
+            "joke": joke_text,
+            "rating": rating
+        }
+
+        logger.info("  😄 Generated joke about '%s' (rating: %d)", topic, rating)
+        jokes.append(joke_data)
+
+    return {"jokes": jokes}
 
 def select_best_joke(state: JokeState):
     """
@@ -227,40 +299,41 @@ def select_best_joke(state: JokeState):
     jokes = state['jokes']
 
     # Mock selection: pick highest rated
-    best = max(jokes, key=lambda j: j['rating'])
+    best = max(jokes, key=itemgetter('rating'))
 
     print(f"\n✅ REDUCE: Selected best joke from {len(jokes)} options")
     print(f"   Winner: '{best['topic']}' (rating: {best['rating']})")
 
     return {"best_joke": best}
 
-# Build graph
-builder_3 = StateGraph(JokeState)
-builder_3.add_node("generate_joke", generate_joke)
-builder_3.add_node("select_best", select_best_joke)
-builder_3.add_conditional_edges(START, map_topics)
-builder_3.add_edge("generate_joke", "select_best")
-builder_3.add_edge("select_best", END)
+@functools.cache
+def get_joke_graph():
+    """Compile the Example 3 graph once, on first use."""
+    builder = StateGraph(JokeState)
+    builder.add_node("generate_joke", generate_joke)
+    builder.add_node("select_best", select_best_joke)
+    builder.add_conditional_edges(START, map_topics)
+    builder.add_edge("generate_joke", "select_best")
+    builder.add_edge("select_best", END)
+
+    return builder.compile()
 
-graph_3 = builder_3.compile()
+def run_joke_example():
+    """Example 3: Generate a joke per topic and pick the best one."""
+    banner("EXAMPLE 3: Joke Generator - Map-Reduce with Mock LLM")
 
-# Run example
-result_3 = graph_3.invoke({
-    "topics": ["cats", "programming", "pizza", "coffee"]
-})
+    result = get_joke_graph().invoke({
+        "topics": ["cats", "programming", "pizza", "coffee"]
+    }, RUN_CONFIG)
 
-print(f"\n🎯 FINAL RESULT:")
-print(f"   Topics: {result_3['topics']}")
-print(f"   Best Joke: {result_3['best_joke']['joke']}")
+    print(f"\n🎯 FINAL RESULT:")
+    print(f"   Topics: {result['topics']}")
+    print(f"   Best Joke: {result['best_joke']['joke']}")
 
 # ============================================================================
-# EXAMPLE 4: Document Research - Multi-Stage Map-Reduce
+# EXAMPLE 4: Document Research - Search and Summarize in One Map Step
 # ============================================================================
 
-print("\n" + "=" * 70)
-print("EXAMPLE 4: Document Research - Nested Map-Reduce")
-print("=" * 70)
-
 class ResearchState(TypedDict):
     """State for document research"""
     queries: List[str]                                  # Input queries
@@ -268,94 +341,92 @@ class ResearchState(TypedDict):
     summaries: Annotated[List[str], operator.add]       # Document summaries
     final_report: str                                   # Final combined report
 
+@dataclass(slots=True, frozen=True)
+class QueryTask:
+    """Send() payload for search_and_summarize"""
+    query: str
+
 def map_queries(state: ResearchState):
-    """MAP STAGE 1: Search for each query"""
-    print(f"\n📤 MAP STAGE 1: Searching {len(state['queries'])} queries")
+    """MAP: Search and summarize each query"""
+    print(f"\n📤 MAP: Researching {len(state['queries'])} queries")
     return [
-        Send("search_query", {"query": query})
+        Send("search_and_summarize", QueryTask(query))
         for query in state['queries']
     ]
 
-def search_query(state: ResearchState):
-    """PROCESS STAGE 1: Search one query (mock)"""
-    query = state['query']
+def search_and_summarize(state: QueryTask):
+    """
+    PROCESS: Search one query, then summarize its document (mock)
+
+    Each query yields exactly one document, so both stages run in the
+    same task. A second map stage would only add a barrier between them
+    and a Send per document.
+    """
+    query = state.query
 
-    # Mock search results
+    # Stage 1 - Mock search results
     doc = {
         "query": query,
         "title": f"Research paper about {query}",
         "content": f"This is detailed information about {query}. " * 3
     }
 
-    print(f"  🔍 Searched: '{query}' → Found 1 document")
-    return {"documents": [doc]}
-
-def map_documents(state: ResearchState):
-    """MAP STAGE 2: Summarize each document"""
-    print(f"\n📤 MAP STAGE 2: Summarizing {len(state['documents'])} documents")
-    return [
-        Send("summarize_doc", {"document": doc})
-        for doc in state['documents']
-    ]
-
-def summarize_doc(state: ResearchState):
-    """PROCESS STAGE 2: Summarize one document (mock)"""
-    doc = state['document']
+    logger.info("  🔍 Searched: '%s' → Found 1 document", query)
 
-    # Mock summarization
+    # Stage 2 - Mock summarization
     summary = f"Summary of '{doc['title']}': Key findings about {doc['query']}."
 
-    print(f"  📝 Summarized: '{doc['title']}'")
-    return {"summaries": [summary]}
+    logger.info("  📝 Summarized: '%s'", doc['title'])
+    return {"documents": [doc], "summaries": [summary]}
 
 def create_report(state: ResearchState):
     """REDUCE: Combine all summaries into final report"""
     summaries = state['summaries']
 
-    report = f"Research Report ({len(summaries)} sources)\n\n"
-    for i, summary in enumerate(summaries, 1):
-        report += f"{i}. {summary}\n"
+    # Build the lines first and join once; += on a str copies the whole
+    # report so far on every iteration
+    lines = [f"Research Report ({len(summaries)} sources)", ""]
+    lines.extend(f"{i}. {summary}" for i, summary in enumerate(summaries, 1))
+    report = "\n".join(lines) + "\n"
 
     print(f"\n✅ REDUCE: Created final report from {len(summaries)} summaries")
 
     return {"final_report": report}
 
-# Build graph with TWO map-reduce stages
-builder_4 = StateGraph(ResearchState)
-builder_4.add_node("search_query", search_query)
-builder_4.add_node("summarize_doc", summarize_doc)
-builder_4.add_node("create_report", create_report)
+@functools.cache
+def get_research_graph():
+    """Compile the Example 4 graph once, on first use."""
+    # Both stages fused into one map step
+    builder = StateGraph(ResearchState)
+    builder.add_node("search_and_summarize", search_and_summarize)
+    builder.add_node("create_report", create_report)
 
-# Stage 1: Map queries → Search
-builder_4.add_conditional_edges(START, map_queries)
+    # Map queries → Search + Summarize
+    builder.add_conditional_edges(START, map_queries)
 
-# Stage 2: Map documents → Summarize
-builder_4.add_conditional_edges("search_query", map_documents)
+    # Final reduce
+    builder.add_edge("search_and_summarize", "create_report")
+    builder.add_edge("create_report", END)
 
-# Final reduce
-builder_4.add_edge("summarize_doc", "create_report")
-builder_4.add_edge("create_report", END)
+    return builder.compile()
 
-graph_4 = builder_4.compile()
+def run_research_example():
+    """Example 4: Search and summarize each query, then build a report."""
+    banner("EXAMPLE 4: Document Research - One Map Step per Query")
 
-# Run example
-result_4 = graph_4.invoke({
-    "queries": ["LangGraph", "Map-Reduce", "Sub-Graphs"]
-})
+    result = get_research_graph().invoke({
+        "queries": ["LangGraph", "Map-Reduce", "Sub-Graphs"]
+    }, RUN_CONFIG)
 
-print(f"\n🎯 FINAL RESULT:")
-print(f"   Queries: {result_4['queries']}")
-print(f"   Documents found: {len(result_4['documents'])}")
-print(f"   Report:\n{result_4['final_report']}")
+    print(f"\n🎯 FINAL RESULT:")
+    print(f"   Queries: {result['queries']}")
+    print(f"   Documents found: {len(result['documents'])}")
+    print(f"   Report:\n{result['final_report']}")
 
 # ============================================================================
 # EXAMPLE 5: Competitive Analysis - Real-World Pattern
 # ============================================================================
 
-print("\n" + "=" * 70)
-print("EXAMPLE 5: Competitive Analysis - Complete Pattern")
-print("=" * 70)
-
 class CompetitorState(TypedDict):
     """State for competitive analysis"""
     companies: List[str]                                # Companies to analyze
@@ -364,33 +435,39 @@ class CompetitorState(TypedDict):
     weaknesses: Annotated[List[str], operator.add]      # All weaknesses found
     recommendation: str                                 # Final recommendation
 
+@dataclass(slots=True, frozen=True)
+class CompanyBatch:
+    """Send() payload for analyze_company"""
+    batch: List[str]
+
 def map_companies(state: CompetitorState):
-    """MAP: Analyze each company"""
+    """MAP: Analyze each batch of companies"""
     print(f"\n📤 MAP: Analyzing {len(state['companies'])} companies")
     return [
-        Send("analyze_company", {"company": company})
-        for company in state['companies']
+        Send("analyze_company", CompanyBatch(batch))
+        for batch in batched(state['companies'])
     ]
 
-def analyze_company(state: CompetitorState):
-    """PROCESS: Analyze one company (mock)"""
-    company = state['company']
-
-    # Mock analysis
-    analysis = {
-        "company": company,
-        "market_share": len(company) * 2,  # Mock metric
-        "growth_rate": len(company) * 1.5,
-        "score": len(company) * 3
-    }
+def analyze_company(state: CompanyBatch):
+    """PROCESS: Analyze one batch of companies (mock)"""
+    analyses, strengths, weaknesses = [], [], []
+    for company in state.batch:
+        # Mock analysis
+        analysis = {
+            "company": company,
+            "market_share": len(company) * 2,  # Mock metric
+            "growth_rate": len(company) * 1.5,
+            "score": len(company) * 3
+        }
 
-    strengths = [f"{company} has strong brand recognition"]
-    weaknesses = [f"{company} lacks presence in emerging markets"]
+        analyses.append(analysis)
+        strengths.append(f"{company} has strong brand recognition")
+        weaknesses.append(f"{company} lacks presence in emerging markets")
 
-    print(f"  🏢 Analyzed: {company} (score: {analysis['score']})")
+        logger.info("  🏢 Analyzed: %s (score: %d)", company, analysis['score'])
 
     return {
-        "analyses": [analysis],
+        "analyses": analyses,
         "strengths": strengths,
         "weaknesses": weaknesses
     }
@@ -402,7 +479,7 @@ def create_recommendation(state: CompetitorState):
     weaknesses = state['weaknesses']
 
     # Find best competitor
-    best = max(analyses, key=lambda a: a['score'])
+    best = max(analyses, key=itemgetter('score'))
 
     recommendation = f"""
 COMPETITIVE ANALYSIS REPORT
@@ -426,90 +503,107 @@ RECOMMENDATION: Focus on differentiating from {best['company']}.
 
     return {"recommendation": recommendation}
 
-# Build graph
-builder_5 = StateGraph(CompetitorState)
-builder_5.add_node("analyze_company", analyze_company)
-builder_5.add_node("create_recommendation", create_recommendation)
-builder_5.add_conditional_edges(START, map_companies)
-builder_5.add_edge("analyze_company", "create_recommendation")
-builder_5.add_edge("create_recommendation", END)
+@functools.cache
+def get_competitor_graph():
+    """Compile the Example 5 graph once, on first use."""
+    builder = StateGraph(CompetitorState)
+    builder.add_node("analyze_company", analyze_company)
+    builder.add_node("create_recommendation", create_recommendation)
+    builder.add_conditional_edges(START, map_companies)
+    builder.add_edge("analyze_company", "create_recommendation")
+    builder.add_edge("create_recommendation", END)
 
-graph_5 = builder_5.compile()
+    return builder.compile()
 
-# Run example
-result_5 = graph_5.invoke({
-    "companies": ["TechCorp", "InnovateCo", "FutureAI", "DataDynamics"]
-})
+def run_competitor_example():
+    """Example 5: Analyze each company and recommend a strategy."""
+    banner("EXAMPLE 5: Competitive Analysis - Complete Pattern")
 
-print(f"\n🎯 FINAL RESULT:")
-print(result_5['recommendation'])
+    result = get_competitor_graph().invoke({
+        "companies": ["TechCorp", "InnovateCo", "FutureAI", "DataDynamics"]
+    }, RUN_CONFIG)
+
+    print(f"\n🎯 FINAL RESULT:")
+    print(result['recommendation'])
 
 # ============================================================================
 # EXAMPLE 6: Dynamic Workload Distribution
 # ============================================================================
 
-print("\n" + "=" * 70)
-print("EXAMPLE 6: Dynamic Workload - Variable Complexity")
-print("=" * 70)
-
 class WorkloadState(TypedDict):
-    """State for variable workload processing"""
-    tasks: List[dict]                               # Tasks with different complexity
-    results: Annotated[List[dict], operator.add]    # Processing results
-    stats: dict                                     # Statistics
+    """
+    State for variable workload processing
+
+    Results are stored column by column (one list per field) rather than
+    as a list of dicts, so the reduce step aggregates whole lists instead
+    of indexing a dict per task.
+    """
+    tasks: List[dict]                                   # Tasks with different complexity
+    task_names: Annotated[List[str], operator.add]      # Result column: task name
+    task_types: Annotated[List[str], operator.add]      # Result column: task type
+    complexities: Annotated[List[int], operator.add]    # Result column: complexity
+    times: Annotated[List[float], operator.add]         # Result column: processing time
+    stats: dict                                         # Statistics
+
+@dataclass(slots=True, frozen=True)
+class TaskBatch:
+    """Send() payload for process_task"""
+    batch: List[dict]
 
 def map_tasks(state: WorkloadState):
-    """MAP: Create processor for each task"""
+    """MAP: Create processor for each batch of tasks"""
     print(f"\n📤 MAP: Distributing {len(state['tasks'])} tasks")
     return [
-        Send("process_task", {"task": task})
-        for task in state['tasks']
+        Send("process_task", TaskBatch(batch))
+        for batch in batched(state['tasks'])
     ]
 
-def process_task(state: WorkloadState):
+def process_task(state: TaskBatch):
     """
-    PROCESS: Handle task with variable complexity
+    PROCESS: Handle a batch of tasks with variable complexity
 
     Different tasks take different amounts of work
     """
-    task = state['task']
-    task_type = task['type']
-    complexity = task['complexity']
-
-    # Simulate different processing based on complexity
-    processing_time = complexity * 0.1  # Mock time
-
-    result = {
-        "task": task['name'],
-        "type": task_type,
-        "complexity": complexity,
-        "time": processing_time,
-        "status": "completed"
-    }
+    names, types, complexities, times = [], [], [], []
+    for task in state.batch:
+        complexity = task['complexity']
 
-    print(f"  ⚙️  Processed: {task['name']} (complexity: {complexity}, time: {processing_time:.1f}s)")
+        # Simulate different processing based on complexity
+        processing_time = complexity * 0.1  # Mock time
 
-    return {"results": [result]}
+        names.append(task['name'])
+        types.append(task['type'])
+        complexities.append(complexity)
+        times.append(processing_time)
+
+        logger.info(
+            "  ⚙️  Processed: %s (complexity: %d, time: %.1fs)",
+            task['name'], complexity, processing_time
+        )
+
+    return {
+        "task_names": names,
+        "task_types": types,
+        "complexities": complexities,
+        "times": times
+    }
 
 def generate_stats(state: WorkloadState):
     """REDUCE: Generate processing statistics"""
-    results = state['results']
+    complexities = state['complexities']
 
-    total_time = sum(r['time'] for r in results)
-    avg_complexity = sum(r['complexity'] for r in results) / len(results)
+    # Whole-column aggregates: no per-task dict lookups. fsum adds the
+    # float times without accumulating rounding error
+    total_time = fsum(state['times'])
+    avg_complexity = fmean(complexities)
 
     stats = {
-        "total_tasks": len(results),
+        "total_tasks": len(state['task_names']),
         "total_time": total_time,
         "avg_complexity": avg_complexity,
-        "types": {}
+        "types": dict(Counter(state['task_types']))  # Count by type
     }
 
-    # Count by type
-    for result in results:
-        task_type = result['type']
-        stats['types'][task_type] = stats['types'].get(task_type, 0) + 1
-
     print(f"\n✅ REDUCE: Generated statistics")
     print(f"   Total tasks: {stats['total_tasks']}")
     print(f"   Total time: {stats['total_time']:.1f}s")
@@ -517,41 +611,47 @@ def generate_stats(state: WorkloadState):
 
     return {"stats": stats}
 
-# Build graph
-builder_6 = StateGraph(WorkloadState)
-builder_6.add_node("process_task", process_task)
-builder_6.add_node("generate_stats", generate_stats)
-builder_6.add_conditional_edges(START, map_tasks)
-builder_6.add_edge("process_task", "generate_stats")
-builder_6.add_edge("generate_stats", END)
-
-graph_6 = builder_6.compile()
-
-# Run example with variable complexity
-result_6 = graph_6.invoke({
-    "tasks": [
-        {"name": "Task A", "type": "analysis", "complexity": 3},
-        {"name": "Task B", "type": "processing", "complexity": 7},
-        {"name": "Task C", "type": "analysis", "complexity": 2},
-        {"name": "Task D", "type": "generation", "complexity": 5},
-        {"name": "Task E", "type": "processing", "complexity": 8},
-    ]
-})
-
-print(f"\n🎯 FINAL RESULT:")
-print(f"   Tasks completed: {result_6['stats']['total_tasks']}")
-print(f"   Types: {result_6['stats']['types']}")
-print(f"   Average complexity: {result_6['stats']['avg_complexity']:.1f}")
+@functools.cache
+def get_workload_graph():
+    """Compile the Example 6 graph once, on first use."""
+    builder = StateGraph(WorkloadState)
+    builder.add_node("process_task", process_task)
+    builder.add_node("generate_stats", generate_stats)
+    builder.add_conditional_edges(START, map_tasks)
+    builder.add_edge("process_task", "generate_stats")
+    builder.add_edge("generate_stats", END)
+
+    return builder.compile()
+
+def run_workload_example():
+    """Example 6: Process tasks of variable complexity and report stats."""
+    banner("EXAMPLE 6: Dynamic Workload - Variable Complexity")
+
+    # Run example with variable complexity
+    result = get_workload_graph().invoke({
+        "tasks": [
+            {"name": "Task A", "type": "analysis", "complexity": 3},
+            {"name": "Task B", "type": "processing", "complexity": 7},
+            {"name": "Task C", "type": "analysis", "complexity": 2},
+            {"name": "Task D", "type": "generation", "complexity": 5},
+            {"name": "Task E", "type": "processing", "complexity": 8},
+        ]
+    }, RUN_CONFIG)
+
+    print(f"\n🎯 FINAL RESULT:")
+    print(f"   Tasks completed: {result['stats']['total_tasks']}")
+    print(f"   Types: {result['stats']['types']}")
+    print(f"   Average complexity: {result['stats']['avg_complexity']:.1f}")
 
 # ============================================================================
 # KEY TAKEAWAYS
 # ============================================================================
 
-print("\n" + "=" * 70)
-print("🎓 KEY TAKEAWAYS - Map-Reduce Patterns")
-print("=" * 70)
+def print_takeaways():
+    """Print the lesson summary."""
+    banner("🎓 KEY TAKEAWAYS - Map-Reduce Patterns")
 
-print("""
+    print("""
 1. **Send API = Dynamic Branching**
    - Create nodes at runtime based on data
    - Pattern: Send("node_name", {"data": value})
@@ -584,21 +684,21 @@ print("""
    - ETL pipelines
 
 7. **Advanced Patterns**
-   - Nested map-reduce (Example 4)
+   - Fused per-item steps in one map task (Example 4)
    - Conditional processing (Example 2)
-   - Multi-stage pipelines
+   - Chained map stages when one item fans out into many
    - Variable complexity workloads
 
 8. **Performance Benefits**
    Sequential: N items × T time = N×T total
    Map-Reduce: max(T for all items) = T total
    Speedup: Up to N× faster!
+   Large inputs: send batches, not single items (MAP_BATCH_SIZE)
+   Rate-limited APIs: cap parallel tasks (MAP_MAX_CONCURRENCY)
 """)
 
-print("\n" + "=" * 70)
-print("✅ MODULE 4 - LESSON 3 COMPLETE!")
-print("=" * 70)
-print("""
+    banner("✅ MODULE 4 - LESSON 3 COMPLETE!")
+    print("""
 You now understand:
 - Send API for dynamic branching
 - Map-Reduce pattern implementation
@@ -607,3 +707,22 @@ You now understand:
 
 Next: Lesson 4 - Research Assistant (bringing it all together!)
 """)
+
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    # Only this lesson's logger prints INFO; library loggers stay quiet
+    logger.setLevel(logging.INFO)
+    logger.addHandler(logging.StreamHandler(sys.stdout))
+
+    # Graphs are compiled lazily, so only the examples run here are built
+    run_basic_example()
+    run_filter_example()
+    run_joke_example()
+    run_research_example()
+    run_competitor_example()
+    run_workload_example()
+    print_takeaways()
@@ -20,71 +20,142 @@ KEY CONCEPTS:
 5. Complete integration of all patterns
 """
 
-from typing import TypedDict, Annotated, List
+from typing import TypedDict, Annotated, Final, List, Tuple
 from langgraph.graph import StateGraph, START, END
 from langgraph.constants import Send
+import asyncio
+import functools
+import logging
 import operator
+import os
+import sys
+from dataclasses import dataclass
+from logging.handlers import MemoryHandler
+
+from _common import banner
+
+_BAR = "=" * 70
+
+# Node progress goes through logging. __main__ routes it into an
+# in-memory buffer that is written to stdout once per example, after the
+# graph finishes, instead of one stdout write per line while nodes run.
+logger = logging.getLogger(__name__)
+_progress_buffer = MemoryHandler(
+    capacity=4096,
+    flushLevel=logging.ERROR,
+    target=logging.StreamHandler(sys.stdout),
+)
+
+
+def flush_progress() -> None:
+    """Write the buffered node progress lines to stdout."""
+    _progress_buffer.flush()
+
+
+def unique_topics(topics: List[str]) -> List[str]:
+    """
+    Drop repeated topics, keeping the first spelling of each
+
+    Topics are compared stripped and casefolded, so "RAG", " rag" and
+    "Rag" fan out as one research task instead of three.
+    """
+    seen = set()
+    unique = []
+    for topic in topics:
+        key = topic.strip().casefold()
+        if key not in seen:
+            seen.add(key)
+            unique.append(topic)
+    return unique
+
+
+@dataclass(slots=True, frozen=True)
+class TopicTask:
+    """
+    Send() payload for the per-topic research nodes
+
+    A slotted, frozen record rather than the parent state: the worker
+    reads state.topic as an attribute, and cached payloads can be shared
+    between runs because nothing can change them.
+    """
+    topic: str
+
+
+@functools.lru_cache(maxsize=64)
+def topic_sends(node: str, topics: Tuple[str, ...]) -> Tuple[Send, ...]:
+    """
+    Build the deduplicated Send() fan-out for a topic list
+
+    Cached by (node, topics): re-running a graph on the same topics
+    reuses the Send objects instead of rebuilding them.
+    """
+    return tuple(Send(node, TopicTask(topic)) for topic in unique_topics(topics))
 
 # ============================================================================
 # EXAMPLE 1: Simple Research Assistant - Basic Integration
 # ============================================================================
 
-print("=" * 70)
-print("EXAMPLE 1: Simple Research Assistant - Basic Integration")
-print("=" * 70)
-
 class SimpleResearchState(TypedDict):
     """State for simple research assistant"""
     query: str                                      # Input query
-    web_results: List[str]                          # Web search results
-    wiki_results: List[str]                         # Wikipedia results
+    web_count: int                                  # Number of web results
+    wiki_count: int                                 # Number of Wikipedia results
     all_results: Annotated[List[str], operator.add] # Combined results
     report: str                                     # Final report
 
-def search_web(state: SimpleResearchState):
+async def web_search(query: str) -> List[str]:
     """
-    PARALLEL NODE 1: Search the web
+    PARALLEL SEARCH 1: Search the web
 
-    Runs in parallel with search_wikipedia
+    Runs concurrently with wikipedia_search
     """
-    query = state['query']
-
     # Mock web search
     results = [
         f"Web result 1 for '{query}': Recent developments...",
         f"Web result 2 for '{query}': Expert analysis...",
     ]
 
-    print(f"  🌐 Web search completed: {len(results)} results")
-    return {
-        "web_results": results,
-        "all_results": results
-    }
+    logger.info("  🌐 Web search completed: %d results", len(results))
+    return results
 
-def search_wikipedia(state: SimpleResearchState):
+async def wikipedia_search(query: str) -> List[str]:
     """
-    PARALLEL NODE 2: Search Wikipedia
+    PARALLEL SEARCH 2: Search Wikipedia
 
-    Runs in parallel with search_web
+    Runs concurrently with web_search
     """
-    query = state['query']
-
     # Mock Wikipedia search
     results = [
         f"Wikipedia for '{query}': Comprehensive overview...",
     ]
 
-    print(f"  📚 Wikipedia search completed: {len(results)} results")
+    logger.info("  📚 Wikipedia search completed: %d results", len(results))
+    return results
+
+async def search_all(state: SimpleResearchState):
+    """
+    PARALLEL NODE: Run both searches at once
+
+    asyncio.gather overlaps the two searches inside ONE node, so the
+    graph needs no fan-in step (one task and one state update, not two)
+    """
+    query = state['query']
+
+    web, wiki = await asyncio.gather(web_search(query), wikipedia_search(query))
+
+    # The report only reads the per-source counts, so store those rather
+    # than a second copy of each result list
     return {
-        "wiki_results": results,
-        "all_results": results
+        "web_count": len(web),
+        "wiki_count": len(wiki),
+        "all_results": web + wiki
     }
 
 def generate_report(state: SimpleResearchState):
     """
     REDUCE NODE: Combine all results
 
-    Waits for BOTH search_web and search_wikipedia to complete
+    Runs once search_all has gathered BOTH searches
     """
     all_results = state['all_results']
 
@@ -94,99 +165,102 @@ RESEARCH REPORT: {state['query']}
 
 Sources Found: {len(all_results)}
 
-Web Results: {len(state.get('web_results', []))}
-Wikipedia Results: {len(state.get('wiki_results', []))}
+Web Results: {state.get('web_count', 0)}
+Wikipedia Results: {state.get('wiki_count', 0)}
 
 Combined Findings:
 {chr(10).join(f"- {r}" for r in all_results)}
 """
 
-    print(f"\n✅ Generated report with {len(all_results)} sources")
+    logger.info("\n✅ Generated report with %d sources", len(all_results))
     return {"report": report}
 
-# Build graph - PARALLELIZATION PATTERN
-builder_1 = StateGraph(SimpleResearchState)
-builder_1.add_node("search_web", search_web)
-builder_1.add_node("search_wikipedia", search_wikipedia)
-builder_1.add_node("generate_report", generate_report)
+@functools.cache
+def get_simple_research_graph():
+    """Compile the Example 1 graph once, on first use."""
+    # PARALLELIZATION PATTERN (inside one async node)
+    builder = StateGraph(SimpleResearchState)
+    builder.add_node("search_all", search_all)
+    builder.add_node("generate_report", generate_report)
 
-# Fan-out: START → both search nodes
-builder_1.add_edge(START, "search_web")
-builder_1.add_edge(START, "search_wikipedia")
+    # START → search_all (web + wiki concurrently) → generate_report
+    builder.add_edge(START, "search_all")
+    builder.add_edge("search_all", "generate_report")
+    builder.add_edge("generate_report", END)
 
-# Fan-in: both searches → generate_report
-builder_1.add_edge(["search_web", "search_wikipedia"], "generate_report")
-builder_1.add_edge("generate_report", END)
+    return builder.compile()
 
-graph_1 = builder_1.compile()
+def run_simple_research_example():
+    """Example 1: Web and Wikipedia searches gathered into one report."""
+    banner("EXAMPLE 1: Simple Research Assistant - Basic Integration")
 
-# Run example
-print("\n🔍 Starting research for: 'LangGraph'")
-result_1 = graph_1.invoke({
-    "query": "LangGraph"
-})
+    # search_all is async, so the graph runs with ainvoke
+    print("\n🔍 Starting research for: 'LangGraph'")
+    result = asyncio.run(get_simple_research_graph().ainvoke({
+        "query": "LangGraph"
+    }))
 
-print(result_1['report'])
+    flush_progress()
+    print(result['report'])
 
 # ============================================================================
 # EXAMPLE 2: Research Assistant with Sub-Graphs
 # ============================================================================
 
-print("\n" + "=" * 70)
-print("EXAMPLE 2: Research Assistant with Analysis Sub-Graph")
-print("=" * 70)
-
 # SUB-GRAPH: Analysis Agent
 class AnalysisState(TypedDict):
     """State for analysis sub-graph"""
     raw_data: str           # Input from parent
-    key_facts: List[str]    # Extracted facts
     summary: str            # Analysis summary
 
+class AnalysisInputState(TypedDict):
+    """What the sub-graph reads from parent"""
+    raw_data: str           # Only the input, not the parent's other keys
+
 class AnalysisOutputState(TypedDict):
     """What the sub-graph returns to parent"""
     summary: str            # Only return summary, not internal details
 
-def extract_facts(state: AnalysisState):
-    """Extract key facts from raw data"""
-    raw = state['raw_data']
+def analyze(state: AnalysisState):
+    """
+    Extract key facts from raw data and summarize them
 
-    # Mock fact extraction
+    One node does both steps: the facts are only an intermediate, so
+    they stay local instead of going through a state channel
+    """
+    # Mock fact extraction; both facts quote the same prefix, so slice once
+    prefix = state['raw_data'][:30]
     facts = [
-        f"Fact 1 from: {raw[:30]}...",
-        f"Fact 2 from: {raw[:30]}...",
+        f"Fact 1 from: {prefix}...",
+        f"Fact 2 from: {prefix}...",
     ]
-
-    print(f"    📊 Extracted {len(facts)} key facts")
-    return {"key_facts": facts}
-
-def create_summary(state: AnalysisState):
-    """Create summary from facts"""
-    facts = state['key_facts']
+    logger.info("    📊 Extracted %d key facts", len(facts))
 
     summary = f"Analysis Summary: {len(facts)} key facts identified"
 
-    print(f"    📝 Created summary")
+    logger.info("    📝 Created summary")
     return {"summary": summary}
 
-# Build analysis sub-graph
-analysis_builder = StateGraph(
-    state_schema=AnalysisState,
-    output_schema=AnalysisOutputState  # Only return summary
-)
-analysis_builder.add_node("extract_facts", extract_facts)
-analysis_builder.add_node("create_summary", create_summary)
-analysis_builder.add_edge(START, "extract_facts")
-analysis_builder.add_edge("extract_facts", "create_summary")
-analysis_builder.add_edge("create_summary", END)
+@functools.cache
+def get_analysis_graph():
+    """Compile the analysis sub-graph once, on first use."""
+    builder = StateGraph(
+        state_schema=AnalysisState,
+        input_schema=AnalysisInputState,   # Only read raw_data
+        output_schema=AnalysisOutputState  # Only return summary
+    )
+    builder.add_node("analyze", analyze)
+    builder.add_edge(START, "analyze")
+    builder.add_edge("analyze", END)
 
-analysis_graph = analysis_builder.compile()
+    return builder.compile()
 
 # PARENT GRAPH: Research with Analysis
 class ResearchWithAnalysisState(TypedDict):
     """Parent state that uses analysis sub-graph"""
     query: str
-    search_results: Annotated[List[str], operator.add]
+    search_results: Annotated[Tuple[str, ...], operator.add]  # Immutable; shared as-is
+    raw_data: str  # Overlapping key - analysis reads this
     summary: str  # Overlapping key - analysis returns this
     final_report: str
 
@@ -194,79 +268,90 @@ def parallel_search(state: ResearchWithAnalysisState):
     """Search multiple sources (simplified)"""
     query = state['query']
 
-    results = [
+    # A tuple: nothing downstream can mutate it, so it needs no copies
+    results = (
         f"Source 1: Information about {query}",
         f"Source 2: Analysis of {query}",
         f"Source 3: Recent updates on {query}",
-    ]
+    )
 
-    print(f"  🔍 Found {len(results)} results")
+    logger.info("  🔍 Found %d results", len(results))
     return {"search_results": results}
 
 def analyze_results(state: ResearchWithAnalysisState):
     """
-    SUB-GRAPH NODE: Analyze search results
+    Hand the search results to the analysis sub-graph
 
-    This is where the analysis sub-graph runs!
+    Writes 'raw_data', the key the sub-graph reads; the sub-graph node
+    runs right after this one
     """
     results = state['search_results']
 
-    print(f"\n  🧠 Analyzing {len(results)} results via sub-graph...")
+    logger.info("\n  🧠 Analyzing %d results via sub-graph...", len(results))
 
     # Pass data to sub-graph
     # Sub-graph processes and returns only 'summary'
     combined_data = " | ".join(results)
     return {"raw_data": combined_data}
 
-def create_final_report(state: ResearchWithAnalysisState):
-    """Create final report using analysis summary"""
-    summary = state['summary']
-    results_count = len(state['search_results'])
-
-    report = f"""
+# Bound str.format method for the report template, looked up once
+_ANALYSIS_REPORT_FORMAT = """
 RESEARCH REPORT WITH ANALYSIS
 ==============================
 
-Query: {state['query']}
-Sources: {results_count}
+Query: {query}
+Sources: {sources}
 
 Analysis: {summary}
 
 Report generated successfully!
-"""
+""".format
 
-    print(f"\n✅ Final report created")
+def create_final_report(state: ResearchWithAnalysisState):
+    """Create final report using analysis summary"""
+    summary = state['summary']
+    results_count = len(state['search_results'])
+
+    report = _ANALYSIS_REPORT_FORMAT(
+        query=state['query'], sources=results_count, summary=summary
+    )
+
+    logger.info("\n✅ Final report created")
     return {"final_report": report}
 
-# Build parent graph with sub-graph
-builder_2 = StateGraph(ResearchWithAnalysisState)
-builder_2.add_node("parallel_search", parallel_search)
-builder_2.add_node("analyze_results", analysis_graph)  # SUB-GRAPH!
-builder_2.add_node("create_final_report", create_final_report)
+@functools.cache
+def get_analysis_research_graph():
+    """Compile the Example 2 parent graph (with its sub-graph) once."""
+    builder = StateGraph(ResearchWithAnalysisState)
+    builder.add_node("parallel_search", parallel_search)
+    builder.add_node("analyze_results", analyze_results)
+    builder.add_node("analysis", get_analysis_graph())  # SUB-GRAPH!
+    builder.add_node("create_final_report", create_final_report)
+
+    builder.add_edge(START, "parallel_search")
+    builder.add_edge("parallel_search", "analyze_results")
+    builder.add_edge("analyze_results", "analysis")
+    builder.add_edge("analysis", "create_final_report")
+    builder.add_edge("create_final_report", END)
 
-builder_2.add_edge(START, "parallel_search")
-builder_2.add_edge("parallel_search", "analyze_results")
-builder_2.add_edge("analyze_results", "create_final_report")
-builder_2.add_edge("create_final_report", END)
+    return builder.compile()
 
-graph_2 = builder_2.compile()
+def run_analysis_research_example():
+    """Example 2: Search, then summarize through the analysis sub-graph."""
+    banner("EXAMPLE 2: Research Assistant with Analysis Sub-Graph")
 
-# Run example
-print("\n🔍 Starting research with analysis...")
-result_2 = graph_2.invoke({
-    "query": "Multi-Agent Systems"
-})
+    print("\n🔍 Starting research with analysis...")
+    result = get_analysis_research_graph().invoke({
+        "query": "Multi-Agent Systems"
+    })
 
-print(result_2['final_report'])
+    flush_progress()
+    print(result['final_report'])
 
 # ============================================================================
 # EXAMPLE 3: Multi-Topic Research with Map-Reduce
 # ============================================================================
 
-print("\n" + "=" * 70)
-print("EXAMPLE 3: Multi-Topic Research - Map-Reduce Integration")
-print("=" * 70)
-
 class MultiTopicState(TypedDict):
     """State for multi-topic research"""
     topics: List[str]                                   # Input topics
@@ -279,20 +364,18 @@ def map_topics(state: MultiTopicState):
 
     This is MAP-REDUCE pattern!
     """
-    print(f"\n📤 MAP: Creating research tasks for {len(state['topics'])} topics")
-    return [
-        Send("research_topic", {"topic": topic})
-        for topic in state['topics']
-    ]
+    sends = topic_sends("research_topic", tuple(state['topics']))
+    logger.info("\n📤 MAP: Creating research tasks for %d topics", len(sends))
+    return list(sends)
 
-def research_topic(state: MultiTopicState):
+def research_topic(state: TopicTask):
     """
     PROCESS STEP: Research one topic
 
     Runs in PARALLEL for each topic
     This simulates: search web + wiki + analyze
     """
-    topic = state['topic']
+    topic = state.topic
 
     # Simulate multi-source research
     web_results = [f"Web info about {topic}"]
@@ -304,68 +387,85 @@ def research_topic(state: MultiTopicState):
         "summary": f"Comprehensive research on {topic} completed"
     }
 
-    print(f"  📊 Researched: '{topic}' ({report['sources']} sources)")
+    logger.info("  📊 Researched: '%s' (%d sources)", topic, report['sources'])
 
     return {"topic_reports": [report]}
 
-def combine_research(state: MultiTopicState):
-    """
-    REDUCE STEP: Combine all topic reports
-    """
-    reports = state['topic_reports']
-
-    summary = f"""
+# Bound str.format methods for the summary templates, looked up once
+_MULTI_TOPIC_HEADER_FORMAT = """
 MULTI-TOPIC RESEARCH SUMMARY
 =============================
 
-Topics Researched: {len(reports)}
-Total Sources: {sum(r['sources'] for r in reports)}
+Topics Researched: {topics}
+Total Sources: {sources}
 
 Individual Reports:
-"""
+""".format
+_MULTI_TOPIC_ROW_FORMAT = "\n{}. {}: {}".format
+
+def combine_research(state: MultiTopicState) -> dict:
+    """
+    REDUCE STEP: Combine all topic reports
+    """
+    reports: List[dict] = state['topic_reports']
+
+    n_reports: int = len(reports)
+    total_sources: int = sum(r['sources'] for r in reports)
 
-    for i, report in enumerate(reports, 1):
-        summary += f"\n{i}. {report['topic']}: {report['summary']}"
+    parts: List[str] = [_MULTI_TOPIC_HEADER_FORMAT(topics=n_reports, sources=total_sources)]
 
-    print(f"\n✅ REDUCE: Combined {len(reports)} topic reports")
+    # Collect the pieces and join once instead of += on a growing string
+    parts.extend(
+        _MULTI_TOPIC_ROW_FORMAT(i, report['topic'], report['summary'])
+        for i, report in enumerate(reports, 1)
+    )
+    summary: str = "".join(parts)
+
+    logger.info("\n✅ REDUCE: Combined %d topic reports", n_reports)
 
     return {"final_summary": summary}
 
-# Build graph - MAP-REDUCE PATTERN
-builder_3 = StateGraph(MultiTopicState)
-builder_3.add_node("research_topic", research_topic)
-builder_3.add_node("combine_research", combine_research)
+@functools.cache
+def get_multi_topic_graph():
+    """Compile the Example 3 graph once, on first use."""
+    # MAP-REDUCE PATTERN
+    builder = StateGraph(MultiTopicState)
+    builder.add_node("research_topic", research_topic)
+    builder.add_node("combine_research", combine_research)
+
+    # Map: Dynamic branching
+    builder.add_conditional_edges(START, map_topics)
 
-# Map: Dynamic branching
-builder_3.add_conditional_edges(START, map_topics)
+    # Reduce: Combine results
+    builder.add_edge("research_topic", "combine_research")
+    builder.add_edge("combine_research", END)
 
-# Reduce: Combine results
-builder_3.add_edge("research_topic", "combine_research")
-builder_3.add_edge("combine_research", END)
+    return builder.compile()
 
-graph_3 = builder_3.compile()
+def run_multi_topic_example():
+    """Example 3: Research several topics with map-reduce."""
+    banner("EXAMPLE 3: Multi-Topic Research - Map-Reduce Integration")
 
-# Run example
-print("\n🔍 Starting multi-topic research...")
-result_3 = graph_3.invoke({
-    "topics": ["LangGraph", "Multi-Agent Systems", "RAG"]
-})
+    print("\n🔍 Starting multi-topic research...")
+    result = get_multi_topic_graph().invoke({
+        "topics": ["LangGraph", "Multi-Agent Systems", "RAG"]
+    })
 
-print(result_3['final_summary'])
+    flush_progress()
+    print(result['final_summary'])
 
 # ============================================================================
 # EXAMPLE 4: Complete Research Assistant - ALL PATTERNS
 # ============================================================================
 
-print("\n" + "=" * 70)
-print("EXAMPLE 4: Complete Research Assistant - ALL Patterns Combined!")
-print("=" * 70)
-
 # SUB-GRAPH 1: Web Search Agent
 class WebSearchState(TypedDict):
     query: str
     results: List[str]
 
+class WebSearchInputState(TypedDict):
+    query: str
+
 class WebSearchOutputState(TypedDict):
     results: List[str]
 
@@ -376,23 +476,30 @@ def web_search_node(state: WebSearchState):
         f"Web: Latest news on {query}",
         f"Web: Expert opinion on {query}",
     ]
-    print(f"    🌐 Web search: {len(results)} results")
+    logger.info("    🌐 Web search: %d results", len(results))
     return {"results": results}
 
-web_search_builder = StateGraph(
-    state_schema=WebSearchState,
-    output_schema=WebSearchOutputState
-)
-web_search_builder.add_node("search", web_search_node)
-web_search_builder.add_edge(START, "search")
-web_search_builder.add_edge("search", END)
-web_search_graph = web_search_builder.compile()
+@functools.cache
+def get_web_search_graph():
+    """Compile the web search sub-graph once, on first use."""
+    builder = StateGraph(
+        state_schema=WebSearchState,
+        input_schema=WebSearchInputState,
+        output_schema=WebSearchOutputState
+    )
+    builder.add_node("search", web_search_node)
+    builder.add_edge(START, "search")
+    builder.add_edge("search", END)
+    return builder.compile()
 
 # SUB-GRAPH 2: Wikipedia Agent
 class WikiSearchState(TypedDict):
     query: str
     results: List[str]
 
+class WikiSearchInputState(TypedDict):
+    query: str
+
 class WikiSearchOutputState(TypedDict):
     results: List[str]
 
@@ -402,70 +509,115 @@ def wiki_search_node(state: WikiSearchState):
     results = [
         f"Wiki: {query} - comprehensive overview",
     ]
-    print(f"    📚 Wiki search: {len(results)} results")
+    logger.info("    📚 Wiki search: %d results", len(results))
     return {"results": results}
 
-wiki_search_builder = StateGraph(
-    state_schema=WikiSearchState,
-    output_schema=WikiSearchOutputState
-)
-wiki_search_builder.add_node("search", wiki_search_node)
-wiki_search_builder.add_edge(START, "search")
-wiki_search_builder.add_edge("search", END)
-wiki_search_graph = wiki_search_builder.compile()
+@functools.cache
+def get_wiki_search_graph():
+    """Compile the Wikipedia search sub-graph once, on first use."""
+    builder = StateGraph(
+        state_schema=WikiSearchState,
+        input_schema=WikiSearchInputState,
+        output_schema=WikiSearchOutputState
+    )
+    builder.add_node("search", wiki_search_node)
+    builder.add_edge(START, "search")
+    builder.add_edge("search", END)
+    return builder.compile()
+
+# SEARCH CACHE: Results per (source, normalized topic)
+# The cache is process-local and only Example 4 searches through it.
+# Topics are deduplicated before the fan-out, so a single run of this
+# lesson never hits it. It only pays off for callers that invoke the
+# complete research graph again in the same process with topics seen
+# before. Results are stored as tuples so a caller cannot mutate the
+# cached copy.
+_SEARCH_GRAPHS = {"web": get_web_search_graph, "wiki": get_wiki_search_graph}
+_SEARCH_CACHE_SIZE = 1024
+_search_cache = {}
+
+async def cached_search(source: str, topic: str) -> tuple:
+    """Run the source's search sub-graph for topic, reusing earlier results"""
+    key = (source, topic.strip().casefold())
+    results = _search_cache.get(key)
+    if results is not None:
+        return results
+
+    result = await _SEARCH_GRAPHS[source]().ainvoke({"query": topic})
+    results = tuple(result['results'])
+    if len(_search_cache) >= _SEARCH_CACHE_SIZE:
+        # Evict the oldest entry (dicts keep insertion order)
+        del _search_cache[next(iter(_search_cache))]
+    _search_cache[key] = results
+    return results
+
+# Upper bound on topics researched at once. Each topic fans out to two
+# sub-graph searches, so a long topic list would otherwise put every
+# search in flight together and run into the providers' rate limits.
+RESEARCH_MAX_CONCURRENCY = max(1, int(os.environ.get("RESEARCH_MAX_CONCURRENCY", "8")))
 
 # MAIN GRAPH: Complete Research Assistant
+@dataclass(slots=True, frozen=True)
+class TopicSummary:
+    """
+    Source counts for one researched topic
+
+    A slotted record instead of a dict per topic: no per-instance
+    __dict__, and fields are read by attribute.
+    """
+    topic: str
+    web_sources: int
+    wiki_sources: int
+
+    @property
+    def total_sources(self) -> int:
+        return self.web_sources + self.wiki_sources
+
 class CompleteResearchState(TypedDict):
     """State for complete research assistant"""
     topics: List[str]                                       # Input topics
-    current_topic: str                                      # Current topic being researched
     web_results: Annotated[List[str], operator.add]        # All web results
     wiki_results: Annotated[List[str], operator.add]       # All wiki results
-    topic_summaries: Annotated[List[dict], operator.add]   # Summaries per topic
+    topic_summaries: Annotated[List[TopicSummary], operator.add]   # Summaries per topic
     final_report: str                                       # Final comprehensive report
 
 def map_research_topics(state: CompleteResearchState):
     """
     MAP-REDUCE: Create research task for each topic
     """
-    print(f"\n📤 MAP-REDUCE: Creating tasks for {len(state['topics'])} topics")
-    return [
-        Send("research_single_topic", {"current_topic": topic})
-        for topic in state['topics']
-    ]
+    sends = topic_sends("research_single_topic", tuple(state['topics']))
+    logger.info("\n📤 MAP-REDUCE: Creating tasks for %d topics", len(sends))
+    return list(sends)
 
-def research_single_topic(state: CompleteResearchState):
+async def research_single_topic(state: TopicTask):
     """
     PARALLELIZATION + SUB-GRAPHS: Research one topic using multiple agents
 
     This node:
     1. Takes one topic
-    2. Calls web search sub-graph
-    3. Calls wiki search sub-graph
-    4. Combines results
-    """
-    topic = state['current_topic']
+    2. Calls web search AND wiki search sub-graphs concurrently
+    3. Combines results
 
-    print(f"\n  📊 Researching topic: '{topic}'")
-    print(f"    Using parallel sub-graphs (web + wiki)...")
+    Both sub-graphs are awaited together, so per-topic latency is the
+    slower of the two searches rather than their sum
+    """
+    topic = state.topic
 
-    # Call web search sub-graph
-    web_result = web_search_graph.invoke({"query": topic})
-    web_data = web_result['results']
+    logger.info("\n  📊 Researching topic: '%s'", topic)
+    logger.info("    Using parallel sub-graphs (web + wiki)...")
 
-    # Call wiki search sub-graph
-    wiki_result = wiki_search_graph.invoke({"query": topic})
-    wiki_data = wiki_result['results']
+    # Call both search sub-graphs at once (cached topics skip the call)
+    web_cached, wiki_cached = await asyncio.gather(
+        cached_search("web", topic),
+        cached_search("wiki", topic),
+    )
+    web_data = list(web_cached)
+    wiki_data = list(wiki_cached)
 
     # Create topic summary
-    summary = {
-        "topic": topic,
-        "web_sources": len(web_data),
-        "wiki_sources": len(wiki_data),
-        "total_sources": len(web_data) + len(wiki_data)
-    }
+    summary = TopicSummary(topic, len(web_data), len(wiki_data))
 
-    print(f"    ✅ Completed: {summary['total_sources']} total sources")
+    logger.info("    ✅ Completed: %d total sources", summary.total_sources)
 
     return {
         "web_results": web_data,
@@ -473,15 +625,10 @@ def research_single_topic(state: CompleteResearchState):
         "topic_summaries": [summary]
     }
 
-def generate_comprehensive_report(state: CompleteResearchState):
-    """
-    REDUCE: Create final comprehensive report
-    """
-    summaries = state['topic_summaries']
-    web_results = state['web_results']
-    wiki_results = state['wiki_results']
-
-    report = f"""
+# Bound str.format methods for the report templates, looked up once.
+# The parts with no fields at all are plain constants, shared by every
+# report as-is rather than copied through str.format.
+_REPORT_HEADER: Final[str] = """
 ╔════════════════════════════════════════════════════════════════╗
 ║        COMPREHENSIVE RESEARCH REPORT                           ║
 ║        Complete Multi-Agent System                             ║
@@ -490,31 +637,30 @@ def generate_comprehensive_report(state: CompleteResearchState):
 📊 RESEARCH OVERVIEW
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-Topics Researched: {len(summaries)}
-Total Web Sources: {len(web_results)}
-Total Wiki Sources: {len(wiki_results)}
-Combined Sources: {len(web_results) + len(wiki_results)}
+"""
+_REPORT_OVERVIEW_FORMAT = """Topics Researched: {topics}
+Total Web Sources: {web}
+Total Wiki Sources: {wiki}
+Combined Sources: {total}
 
 📚 TOPIC BREAKDOWN
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-"""
-
-    for i, summary in enumerate(summaries, 1):
-        report += f"""
-{i}. {summary['topic']}
-   • Web Sources: {summary['web_sources']}
-   • Wiki Sources: {summary['wiki_sources']}
-   • Total: {summary['total_sources']} sources
-"""
-
-    report += f"""
+""".format
+_TOPIC_ROW_FORMAT = """
+{i}. {s.topic}
+   • Web Sources: {s.web_sources}
+   • Wiki Sources: {s.wiki_sources}
+   • Total: {s.total_sources} sources
+""".format
+_REPORT_PATTERNS_FORMAT = """
 🎯 SYSTEM PERFORMANCE
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 Patterns Used:
-✅ Map-Reduce: Processed {len(summaries)} topics dynamically
-✅ Parallelization: Web + Wiki searches ran simultaneously
+✅ Map-Reduce: Processed {topics} topics dynamically
+""".format
+_REPORT_FOOTER: Final[str] = """✅ Parallelization: Web + Wiki searches ran simultaneously
 ✅ Sub-Graphs: Modular search agents (web_search, wiki_search)
 
 Benefits:
@@ -527,45 +673,86 @@ Benefits:
 Report generated successfully! ✅
 """
 
-    print(f"\n✅ COMPREHENSIVE REPORT GENERATED")
-    print(f"   Topics: {len(summaries)}")
-    print(f"   Total sources: {len(web_results) + len(wiki_results)}")
+def generate_comprehensive_report(state: CompleteResearchState) -> dict:
+    """
+    REDUCE: Create final comprehensive report
+
+    The two reduce functions are fully annotated, so they can be compiled
+    with mypyc as-is if report assembly ever shows up in a profile.
+    """
+    summaries: List[TopicSummary] = state['topic_summaries']
+
+    # Every count the report needs, computed once
+    n_topics: int = len(summaries)
+    n_web: int = len(state['web_results'])
+    n_wiki: int = len(state['wiki_results'])
+    n_total: int = n_web + n_wiki
+
+    parts: List[str] = [
+        _REPORT_HEADER,
+        _REPORT_OVERVIEW_FORMAT(
+            topics=n_topics, web=n_web, wiki=n_wiki, total=n_total
+        ),
+    ]
+
+    # Collect the pieces and join once instead of += on a growing string
+    parts.extend(
+        _TOPIC_ROW_FORMAT(i=i, s=summary)
+        for i, summary in enumerate(summaries, 1)
+    )
+
+    parts.append(_REPORT_PATTERNS_FORMAT(topics=n_topics))
+    parts.append(_REPORT_FOOTER)
+    report: str = "".join(parts)
+
+    logger.info("\n✅ COMPREHENSIVE REPORT GENERATED")
+    logger.info("   Topics: %d", n_topics)
+    logger.info("   Total sources: %d", n_total)
 
     return {"final_report": report}
 
-# Build complete graph - ALL PATTERNS
-builder_4 = StateGraph(CompleteResearchState)
-builder_4.add_node("research_single_topic", research_single_topic)
-builder_4.add_node("generate_comprehensive_report", generate_comprehensive_report)
+@functools.cache
+def get_complete_research_graph():
+    """Compile the Example 4 graph once, on first use."""
+    # ALL PATTERNS
+    builder = StateGraph(CompleteResearchState)
+    builder.add_node("research_single_topic", research_single_topic)
+    builder.add_node("generate_comprehensive_report", generate_comprehensive_report)
 
-# Map-Reduce: Dynamic topic branching
-builder_4.add_conditional_edges(START, map_research_topics)
+    # Map-Reduce: Dynamic topic branching
+    builder.add_conditional_edges(START, map_research_topics)
 
-# Reduce: Combine all research
-builder_4.add_edge("research_single_topic", "generate_comprehensive_report")
-builder_4.add_edge("generate_comprehensive_report", END)
+    # Reduce: Combine all research
+    builder.add_edge("research_single_topic", "generate_comprehensive_report")
+    builder.add_edge("generate_comprehensive_report", END)
 
-graph_4 = builder_4.compile()
+    return builder.compile()
 
-# Run complete example
-print("\n🚀 Starting COMPLETE research assistant...")
-print("   This demonstrates ALL Module 4 patterns working together!")
+def run_complete_research_example():
+    """Example 4: Map-reduce over topics, each using both search sub-graphs."""
+    banner("EXAMPLE 4: Complete Research Assistant - ALL Patterns Combined!")
 
-result_4 = graph_4.invoke({
-    "topics": ["LangGraph", "Multi-Agent Systems", "Sub-Graphs", "Map-Reduce"]
-})
+    print("\n🚀 Starting COMPLETE research assistant...")
+    print("   This demonstrates ALL Module 4 patterns working together!")
 
-print(result_4['final_report'])
+    # research_single_topic is async, so the graph runs with ainvoke;
+    # max_concurrency caps how many topic tasks run together
+    result = asyncio.run(get_complete_research_graph().ainvoke({
+        "topics": ["LangGraph", "Multi-Agent Systems", "Sub-Graphs", "Map-Reduce"]
+    }, {"max_concurrency": RESEARCH_MAX_CONCURRENCY}))
+
+    flush_progress()
+    print(result['final_report'])
 
 # ============================================================================
 # KEY TAKEAWAYS
 # ============================================================================
 
-print("\n" + "=" * 70)
-print("🎓 KEY TAKEAWAYS - Complete Multi-Agent Systems")
-print("=" * 70)
+def print_takeaways():
+    """Print the lesson and module summary."""
+    banner("🎓 KEY TAKEAWAYS - Complete Multi-Agent Systems")
 
-print("""
+    print("""
 ╔════════════════════════════════════════════════════════════════╗
 ║  YOU NOW UNDERSTAND PRODUCTION MULTI-AGENT SYSTEMS!            ║
 ╚════════════════════════════════════════════════════════════════╝
@@ -669,5 +856,22 @@ Next: Module 5 - Memory & Persistence
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 """)
 
-print("✅ MODULE 4 - COMPLETE! ALL 4 LESSONS FINISHED!")
-print("=" * 70)
+    print("✅ MODULE 4 - COMPLETE! ALL 4 LESSONS FINISHED!")
+    print(_BAR)
+
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+if __name__ == "__main__":
+    # Only this lesson's logger prints INFO; library loggers stay quiet
+    logger.setLevel(logging.INFO)
+    logger.addHandler(_progress_buffer)
+
+    # Graphs are compiled lazily, so only the examples run here are built
+    run_simple_research_example()
+    run_analysis_research_example()
+    run_multi_topic_example()
+    run_complete_research_example()
+    print_takeaways()
@@ -0,0 +1,28 @@
+"""
+Module 4 - Shared Helpers
+
+Output helpers shared by the Module 4 lessons.
+
+Author: Klement G
+Date: 2026-01-14
+Course: LangChain Academy - Introduction to LangGraph
+"""
+
+import sys
+
+
+# =============================================================================
+# OUTPUT HELPERS
+# =============================================================================
+
+def banner(title: str, sep: str = "=" * 70) -> None:
+    """
+    Print a title framed by separator lines.
+
+    The three lines go out in a single write instead of three print calls.
+
+    Args:
+        title: Text between the separators
+        sep: Separator line
+    """
+    sys.stdout.write(f"\n{sep}\n{title}\n{sep}\n")